@@ -1,11 +1,23 @@
+import copy
 import datetime
+import functools
+import hashlib
+import json
 import os
 import sys
-from typing import Any, Dict, List
+from collections import OrderedDict
+from operator import itemgetter
+from typing import Any, Dict, List, Tuple
 
+import numpy as np
 from flask import Flask, jsonify, request, send_from_directory
 from flask_cors import CORS
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional accelerator
+    orjson = None
+
 # Ensure src/ is on path when running as a script
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 SRC = os.path.join(ROOT, "src")
@@ -13,37 +25,111 @@ if SRC not in sys.path:
     sys.path.insert(0, SRC)
 
 from vrp.data import generate_branch, generate_targets
+from vrp.geo import haversine_km_matrix
 from vrp.solver import build_global_plan
 
 app = Flask(__name__, static_folder="../frontend", static_url_path="/")
 CORS(app)
 
 
+def _json(obj: Any):
+    """
+    Serialize an API payload with orjson (C-backed, numpy-aware) when
+    available, falling back to Flask's jsonify.
+    """
+    if orjson is None:
+        return jsonify(obj)
+    return app.response_class(orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY), mimetype="application/json")
+
+
 def _next_weekdays(start: datetime.date, n: int = 5) -> List[str]:
-    dates: List[str] = []
-    cursor = start
-    # shift to weekday if weekend
-    while cursor.weekday() >= 5:
-        cursor += datetime.timedelta(days=1)
-    while len(dates) < n:
-        if cursor.weekday() < 5:
-            dates.append(str(cursor))
-        cursor += datetime.timedelta(days=1)
-    return dates
+    # roll='forward' shifts a weekend start to Monday, then offsets walk weekdays.
+    days = np.busday_offset(np.datetime64(start), np.arange(n), roll="forward")
+    return [str(d) for d in days]
+
+
+@functools.lru_cache(maxsize=4)
+def _weekdays_from(start_iso: str, n: int) -> Tuple[str, ...]:
+    return tuple(_next_weekdays(datetime.date.fromisoformat(start_iso), n=n))
 
 
 def default_dates() -> List[str]:
-    return _next_weekdays(datetime.date.today(), n=5)
+    # Memoized per calendar day; repeated same-day requests skip the weekday walk.
+    return list(_weekdays_from(str(datetime.date.today()), 5))
 
 
-def drivers_for_preset(preset: str) -> List[Dict[str, Any]]:
+@functools.lru_cache(maxsize=32)
+def _travel_time_matrix(branch_lat: float, branch_lon: float, coords: Tuple[Tuple[float, float], ...], speed_kmph: float) -> np.ndarray:
+    """
+    Precompute the (N+1)x(N+1) travel-minute matrix for branch + target coords.
+    Cached so identical retries (same targets/speed) skip the O(N^2) haversine pass.
+    """
+    lats = np.array([branch_lat] + [c[0] for c in coords], dtype=np.float64)
+    lons = np.array([branch_lon] + [c[1] for c in coords], dtype=np.float64)
+    return (haversine_km_matrix(lats, lons) * (60.0 / speed_kmph)).astype(np.float32)
+
+
+@functools.lru_cache(maxsize=8)
+def _drivers_for_preset(preset: str) -> Tuple[Tuple[str, int, int], ...]:
     if preset == "three":
-        return [
-            {"id": "A", "start_time": 8 * 60, "end_time": 19 * 60},
-            {"id": "B", "start_time": 8 * 60, "end_time": 19 * 60},
-            {"id": "C", "start_time": 8 * 60, "end_time": 19 * 60},
-        ]
-    return [{"id": "A", "start_time": 8 * 60, "end_time": 19 * 60}]
+        return (("A", 8 * 60, 19 * 60), ("B", 8 * 60, 19 * 60), ("C", 8 * 60, 19 * 60))
+    return (("A", 8 * 60, 19 * 60),)
+
+
+def drivers_for_preset(preset: str) -> List[Dict[str, Any]]:
+    # Materialize fresh dicts so callers can mutate without polluting the cache.
+    return [{"id": i, "start_time": s, "end_time": e} for i, s, e in _drivers_for_preset(preset)]
+
+
+# LRU of solved plans keyed on the solver-relevant request fields, so frontend
+# re-renders with an identical body skip the solver entirely.
+_PLAN_CACHE: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+_PLAN_CACHE_MAX = 32
+
+
+def _plan_cache_key(payload: Any) -> bytes:
+    if orjson is not None:
+        raw = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        raw = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+
+def _plan_cache_get(key: bytes) -> Any:
+    plan = _PLAN_CACHE.get(key)
+    if plan is None:
+        return None
+    _PLAN_CACHE.move_to_end(key)
+    return copy.deepcopy(plan)
+
+
+def _plan_cache_put(key: bytes, plan: Dict[str, Any]) -> None:
+    _PLAN_CACHE[key] = copy.deepcopy(plan)
+    _PLAN_CACHE.move_to_end(key)
+    while len(_PLAN_CACHE) > _PLAN_CACHE_MAX:
+        _PLAN_CACHE.popitem(last=False)
+
+
+_target_fields = itemgetter("lat", "lon", "stay_minutes")
+
+
+def _targets_by_id(targets: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Map target id -> map-rendering fields, extracting the mandatory fields per
+    target in one C-level itemgetter call.
+    """
+    out: Dict[str, Dict[str, Any]] = {}
+    for t in targets:
+        lat, lon, stay = _target_fields(t)
+        out[t["id"]] = {
+            "lat": lat,
+            "lon": lon,
+            "stay_minutes": stay,
+            "time_window": t.get("time_window"),
+            "datetime_window": t.get("datetime_window"),
+            "required": t.get("required", False),
+        }
+    return out
 
 
 @app.route("/")
@@ -74,30 +160,28 @@ def api_plan():
     for d in dates:
         drivers_by_date[d] = body.get("drivers", drivers_for_preset(preset))
 
-    plan = build_global_plan(
-        dates=dates,
-        branch=branch,
-        drivers_by_date=drivers_by_date,
-        targets=targets,
-        speed_kmph=speed_kmph,
-        max_solve_seconds=max_solve_seconds,
-    )
+    cache_key = _plan_cache_key([dates, branch, drivers_by_date, targets, speed_kmph, max_solve_seconds])
+    plan = _plan_cache_get(cache_key)
+    if plan is None:
+        coords = tuple((t["lat"], t["lon"]) for t in targets)
+        travel_time_matrix = _travel_time_matrix(branch["lat"], branch["lon"], coords, speed_kmph)
+
+        plan = build_global_plan(
+            dates=dates,
+            branch=branch,
+            drivers_by_date=drivers_by_date,
+            targets=targets,
+            speed_kmph=speed_kmph,
+            max_solve_seconds=max_solve_seconds,
+            travel_time_matrix=travel_time_matrix,
+        )
+        _plan_cache_put(cache_key, plan)
 
     # attach branch/targets for map rendering convenience
     plan["branch"] = branch
     plan["targets"] = targets
-    plan["targets_by_id"] = {
-        t["id"]: {
-            "lat": t["lat"],
-            "lon": t["lon"],
-            "stay_minutes": t["stay_minutes"],
-            "time_window": t.get("time_window"),
-            "datetime_window": t.get("datetime_window"),
-            "required": t.get("required", False),
-        }
-        for t in targets
-    }
-    return jsonify(plan)
+    plan["targets_by_id"] = _targets_by_id(targets)
+    return _json(plan)
 
 
 @app.route("/api/targets", methods=["GET"])
@@ -114,7 +198,7 @@ def api_targets():
         base = datetime.date.today()
     dates = _next_weekdays(base, n=5)
     targets = generate_targets(seed=999, n=count, center=(branch["lat"], branch["lon"]), cluster_radius_km=30, dates=dates)
-    return jsonify({"branch": branch, "targets": targets})
+    return _json({"branch": branch, "targets": targets})
 
 
 @app.route("/<path:path>")
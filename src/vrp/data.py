@@ -2,13 +2,33 @@
 Data generation and model structures.
 """
 
+import functools
 import math
 import random
 import datetime
 from typing import List, Optional, Tuple, Dict, Any
 
+import numpy as np
+
+try:
+    from numba import njit
+
+    _HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - numba is an optional accelerator
+    _HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        def wrap(fn):
+            return fn
+
+        return wrap
+
+
 CEBU_LAT_RANGE = (9.9, 11.5)
 CEBU_LON_RANGE = (123.4, 124.2)
+# Hoisted scalar bounds: avoids tuple indexing in per-point hot paths.
+CEBU_LAT_MIN, CEBU_LAT_MAX = CEBU_LAT_RANGE
+CEBU_LON_MIN, CEBU_LON_MAX = CEBU_LON_RANGE
 # 粗いCebu島ポリゴン（lon, lat）。陸地判定用にシンプルな輪郭を用意。
 CEBU_POLYGON = [
     (123.45, 10.00),
@@ -31,42 +51,150 @@ CEBU_POLYGON = [
     (123.46, 9.90),
 ]
 
+# SoA storage of the polygon: X = lon, Y = lat, with rolled next-vertex copies.
+CEBU_POLY_X = np.array([p[0] for p in CEBU_POLYGON], dtype=np.float64)
+CEBU_POLY_Y = np.array([p[1] for p in CEBU_POLYGON], dtype=np.float64)
+_CEBU_POLY_X_NEXT = np.roll(CEBU_POLY_X, -1)
+_CEBU_POLY_Y_NEXT = np.roll(CEBU_POLY_Y, -1)
+
+
 def point_in_polygon(lon: float, lat: float, polygon: List[Tuple[float, float]]) -> bool:
     """
-    Ray-casting point-in-polygon (lon, lat). Polygon is list of (lon, lat).
+    Ray-casting point-in-polygon (lon, lat), vectorized over all edges at once.
+    Polygon is list of (lon, lat); the module polygon reuses precomputed arrays.
+    """
+    if polygon is CEBU_POLYGON:
+        x1, y1, x2, y2 = CEBU_POLY_X, CEBU_POLY_Y, _CEBU_POLY_X_NEXT, _CEBU_POLY_Y_NEXT
+    else:
+        pts = np.asarray(polygon, dtype=np.float64)
+        x1, y1 = pts[:, 0], pts[:, 1]
+        x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+    # Edges crossing the horizontal ray to the right of the point flip parity.
+    crosses = (y1 > lat) != (y2 > lat)
+    x_int = (x2 - x1) * (lat - y1) / (y2 - y1 + 1e-12) + x1
+    return bool(np.bitwise_xor.reduce(crosses & (lon < x_int)))
+
+
+@njit(cache=True)
+def _ray_cast(lon: float, lat: float, poly_lon: np.ndarray, poly_lat: np.ndarray) -> bool:
+    """
+    Ray-cast polygon test over SoA coordinate arrays (JIT-compiled when numba
+    is installed). Semantics match `point_in_polygon`.
     """
     inside = False
-    n = len(polygon)
+    n = poly_lon.shape[0]
     for i in range(n):
-        x1, y1 = polygon[i]
-        x2, y2 = polygon[(i + 1) % n]
-        # Check if edge crosses the horizontal ray to the right of the point.
-        if ((y1 > lat) != (y2 > lat)):
-            x_int = x1 + (lon - x1) * 0  # placeholder to avoid lint warning
+        x1 = poly_lon[i]
+        y1 = poly_lat[i]
+        x2 = poly_lon[(i + 1) % n]
+        y2 = poly_lat[(i + 1) % n]
+        if (y1 > lat) != (y2 > lat):
             x_int = (x2 - x1) * (lat - y1) / (y2 - y1 + 1e-12) + x1
             if lon < x_int:
                 inside = not inside
     return inside
 
 
-def generate_branch(seed: int) -> Dict[str, Any]:
+def points_in_polygon(lons: np.ndarray, lats: np.ndarray) -> np.ndarray:
     """
-    Generate a branch/base location (lat, lon) within Cebu island bounds.
+    Vectorized ray-cast land test for arrays of points against the Cebu polygon.
     """
-    rng = random.Random(seed)
+    lon = np.asarray(lons, dtype=np.float64)[:, None]
+    lat = np.asarray(lats, dtype=np.float64)[:, None]
+    crosses = (CEBU_POLY_Y > lat) != (_CEBU_POLY_Y_NEXT > lat)
+    x_int = (_CEBU_POLY_X_NEXT - CEBU_POLY_X) * (lat - CEBU_POLY_Y) / (_CEBU_POLY_Y_NEXT - CEBU_POLY_Y + 1e-12) + CEBU_POLY_X
+    return np.bitwise_xor.reduce(crosses & (lon < x_int), axis=1)
+
+
+def _build_cebu_mask(resolution: int = 512) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rasterize CEBU_POLYGON over the bounding box once at module load.
+    Returns (inside, boundary) cell masks: `inside` cells are fully inside the
+    polygon, `boundary` cells touch an edge and need the exact test.
+    """
+    lon_edges = np.linspace(CEBU_LON_RANGE[0], CEBU_LON_RANGE[1], resolution + 1)
+    lat_edges = np.linspace(CEBU_LAT_RANGE[0], CEBU_LAT_RANGE[1], resolution + 1)
+    lon_g = lon_edges[None, :]
+    lat_g = lat_edges[:, None]
+    corner_inside = np.zeros((resolution + 1, resolution + 1), dtype=bool)
+    n = len(CEBU_POLYGON)
+    for i in range(n):
+        x1, y1 = CEBU_POLYGON[i]
+        x2, y2 = CEBU_POLYGON[(i + 1) % n]
+        crosses = (y1 > lat_g) != (y2 > lat_g)
+        x_int = (x2 - x1) * (lat_g - y1) / (y2 - y1 + 1e-12) + x1
+        corner_inside ^= crosses & (lon_g < x_int)
+    corner_count = (
+        corner_inside[:-1, :-1].astype(np.int8)
+        + corner_inside[1:, :-1]
+        + corner_inside[:-1, 1:]
+        + corner_inside[1:, 1:]
+    )
+    inside = corner_count == 4
+    boundary = (corner_count > 0) & (corner_count < 4)
+    # Cells containing a polygon vertex may notch past all four corners; force exact test.
+    for x, y in CEBU_POLYGON:
+        i = min(int((y - CEBU_LAT_RANGE[0]) / (CEBU_LAT_RANGE[1] - CEBU_LAT_RANGE[0]) * resolution), resolution - 1)
+        j = min(int((x - CEBU_LON_RANGE[0]) / (CEBU_LON_RANGE[1] - CEBU_LON_RANGE[0]) * resolution), resolution - 1)
+        if 0 <= i < resolution and 0 <= j < resolution:
+            boundary[i, j] = True
+            inside[i, j] = False
+    return inside, boundary
+
+
+_CEBU_MASK_RESOLUTION = 512
+_CEBU_MASK_INSIDE, _CEBU_MASK_BOUNDARY = _build_cebu_mask(_CEBU_MASK_RESOLUTION)
+_CEBU_MASK_SCALE_LAT = _CEBU_MASK_RESOLUTION / (CEBU_LAT_MAX - CEBU_LAT_MIN)
+_CEBU_MASK_SCALE_LON = _CEBU_MASK_RESOLUTION / (CEBU_LON_MAX - CEBU_LON_MIN)
+
+
+def _exact_land_test(lon: float, lat: float) -> bool:
+    if _HAVE_NUMBA:
+        return bool(_ray_cast(lon, lat, CEBU_POLY_X, CEBU_POLY_Y))
+    return point_in_polygon(lon, lat, CEBU_POLYGON)
 
-    def inside(lon: float, lat: float) -> bool:
-        return point_in_polygon(lon, lat, CEBU_POLYGON)
 
+def point_in_cebu(lon: float, lat: float) -> bool:
+    """
+    O(1) land test against the precomputed mask; falls back to the exact
+    ray-cast only for cells crossed by the polygon boundary.
+    """
+    if not (CEBU_LAT_MIN <= lat <= CEBU_LAT_MAX and CEBU_LON_MIN <= lon <= CEBU_LON_MAX):
+        # The coarse polygon pokes slightly outside the sampling bbox; stay exact there.
+        return _exact_land_test(lon, lat)
+    res = _CEBU_MASK_RESOLUTION
+    i = int((lat - CEBU_LAT_MIN) * _CEBU_MASK_SCALE_LAT)
+    j = int((lon - CEBU_LON_MIN) * _CEBU_MASK_SCALE_LON)
+    if i >= res:
+        i = res - 1
+    if j >= res:
+        j = res - 1
+    if _CEBU_MASK_BOUNDARY[i, j]:
+        return _exact_land_test(lon, lat)
+    return bool(_CEBU_MASK_INSIDE[i, j])
+
+
+@functools.lru_cache(maxsize=16)
+def _branch_latlon(seed: int) -> Tuple[float, float]:
+    rng = random.Random(seed)
     for _ in range(100):
         lat = rng.uniform(*CEBU_LAT_RANGE)
         lon = rng.uniform(*CEBU_LON_RANGE)
-        if inside(lon, lat):
-            return {"lat": round(lat, 6), "lon": round(lon, 6)}
+        if point_in_cebu(lon, lat):
+            return round(lat, 6), round(lon, 6)
     # Fallback: return center of bounding box if sampling failed
     lat = sum(CEBU_LAT_RANGE) / 2
     lon = sum(CEBU_LON_RANGE) / 2
-    return {"lat": round(lat, 6), "lon": round(lon, 6)}
+    return round(lat, 6), round(lon, 6)
+
+
+def generate_branch(seed: int) -> Dict[str, Any]:
+    """
+    Generate a branch/base location (lat, lon) within Cebu island bounds.
+    Deterministic per seed; the sampled coordinates are memoized.
+    """
+    lat, lon = _branch_latlon(seed)
+    return {"lat": lat, "lon": lon}
 
 
 def generate_targets(
@@ -86,52 +214,64 @@ def generate_targets(
     """
     rng = random.Random(seed)
     targets: List[Dict[str, Any]] = []
-    earth_radius_km = 6371.0
-    seen: set[Tuple[float, float]] = set()
-
-    def inside(lon: float, lat: float) -> bool:
-        return point_in_polygon(lon, lat, CEBU_POLYGON)
 
-    def clamp_latlon(lat: float, lon: float) -> Tuple[float, float]:
-        lat = min(max(lat, CEBU_LAT_RANGE[0]), CEBU_LAT_RANGE[1])
-        lon = min(max(lon, CEBU_LON_RANGE[0]), CEBU_LON_RANGE[1])
-        return lat, lon
+    # Pre-draw all candidate points (n rows x `attempts` columns) in one pass,
+    # then consume the first valid candidate per row; Python retries become rare.
+    attempts = 20
+    g = np.random.default_rng(seed)
+    if center and cluster_radius_km:
+        earth_radius_km = 6371.0
+        bearing = g.uniform(0.0, 2.0 * math.pi, size=n * attempts)
+        ang_dist = g.uniform(0.0, cluster_radius_km, size=n * attempts) / earth_radius_km
+        # The center is fixed: compute its trig once and share the per-candidate
+        # sin/cos arrays between the lat and lon formulas.
+        lon1 = math.radians(center[1])
+        lat1 = math.radians(center[0])
+        sin_lat1 = math.sin(lat1)
+        cos_lat1 = math.cos(lat1)
+        sin_ang = np.sin(ang_dist)
+        cos_ang = np.cos(ang_dist)
+        sin_lat2 = sin_lat1 * cos_ang + cos_lat1 * sin_ang * np.cos(bearing)
+        lat2 = np.arcsin(sin_lat2)
+        lon2 = lon1 + np.arctan2(
+            np.sin(bearing) * sin_ang * cos_lat1,
+            cos_ang - sin_lat1 * sin_lat2,
+        )
+        cand_lat = np.clip(np.degrees(lat2), CEBU_LAT_MIN, CEBU_LAT_MAX)
+        cand_lon = np.clip(np.degrees(lon2), CEBU_LON_MIN, CEBU_LON_MAX)
+    else:
+        cand_lat = g.uniform(CEBU_LAT_MIN, CEBU_LAT_MAX, size=n * attempts)
+        cand_lon = g.uniform(CEBU_LON_MIN, CEBU_LON_MAX, size=n * attempts)
+    cand_lat = np.round(cand_lat, 6)
+    cand_lon = np.round(cand_lon, 6)
+    valid = points_in_polygon(cand_lon, cand_lat)
+    # Dedup without a Python set: encode rounded coords into a single int64 key
+    # and keep only the first occurrence of each key across the whole batch.
+    keys = (np.round(cand_lat * 1e6).astype(np.int64) << 24) | (np.round(cand_lon * 1e6).astype(np.int64) & 0xFFFFFF)
+    first_occurrence = np.zeros(keys.size, dtype=bool)
+    first_occurrence[np.unique(keys, return_index=True)[1]] = True
+    valid = (valid & first_occurrence).reshape(n, attempts)
+    cand_lat = cand_lat.reshape(n, attempts)
+    cand_lon = cand_lon.reshape(n, attempts)
+    first_valid = np.argmax(valid, axis=1)
+    has_valid = valid.any(axis=1)
+    # Bulk-draw per-target attributes; 30% required by default.
+    stays = g.integers(stay_minutes_range[0], stay_minutes_range[1] + 1, size=n)
+    required_flags = g.random(n) < 0.3
 
     for i in range(n):
-        stay = rng.randint(stay_minutes_range[0], stay_minutes_range[1])
-        for _ in range(20):
-            if center and cluster_radius_km:
-                bearing = rng.uniform(0, 2 * math.pi)
-                distance_km = rng.uniform(0, cluster_radius_km)
-                ang_dist = distance_km / earth_radius_km
-                lat1 = math.radians(center[0])
-                lon1 = math.radians(center[1])
-                lat2 = math.asin(math.sin(lat1) * math.cos(ang_dist) + math.cos(lat1) * math.sin(ang_dist) * math.cos(bearing))
-                lon2 = lon1 + math.atan2(
-                    math.sin(bearing) * math.sin(ang_dist) * math.cos(lat1),
-                    math.cos(ang_dist) - math.sin(lat1) * math.sin(lat2),
-                )
-                lat_deg = math.degrees(lat2)
-                lon_deg = math.degrees(lon2)
-                lat, lon = clamp_latlon(lat_deg, lon_deg)
-            else:
-                lat = rng.uniform(*CEBU_LAT_RANGE)
-                lon = rng.uniform(*CEBU_LON_RANGE)
-            lat_r = round(lat, 6)
-            lon_r = round(lon, 6)
-            if (lat_r, lon_r) not in seen and inside(lon_r, lat_r):
-                seen.add((lat_r, lon_r))
-                lat, lon = lat_r, lon_r
-                break
-        else:
-            # If all attempts collide, jitter slightly and keep the sampled stay.
-            lat = round(lat + rng.uniform(-0.0003, 0.0003), 6)
-            lon = round(lon + rng.uniform(-0.0003, 0.0003), 6)
-            if inside(lon, lat):
-                seen.add((lat, lon))
-
-        # 30% required by default.
-        required = rng.random() < 0.3
+        stay = int(stays[i])
+        lat = lon = None
+        if has_valid[i]:
+            k = first_valid[i]
+            lat = float(cand_lat[i, k])
+            lon = float(cand_lon[i, k])
+        if lat is None:
+            # If all attempts collide or miss land, jitter slightly and keep the sampled stay.
+            lat = round(float(cand_lat[i, -1]) + float(g.uniform(-0.0003, 0.0003)), 6)
+            lon = round(float(cand_lon[i, -1]) + float(g.uniform(-0.0003, 0.0003)), 6)
+
+        required = bool(required_flags[i])
 
         targets.append(
             {
@@ -4,8 +4,12 @@ Geospatial utilities for VRP.
 
 from typing import Tuple
 
+import numpy as np
+
 Point = Tuple[float, float]
 
+EARTH_RADIUS_KM = 6371.0088  # mean Earth radius in km
+
 
 def haversine_km(origin: Point, destination: Point) -> float:
     """
@@ -15,7 +19,7 @@ def haversine_km(origin: Point, destination: Point) -> float:
 
     lat1, lon1 = origin
     lat2, lon2 = destination
-    r = 6371.0088  # mean Earth radius in km
+    r = EARTH_RADIUS_KM
     phi1, phi2 = math.radians(lat1), math.radians(lat2)
     dphi = math.radians(lat2 - lat1)
     dlambda = math.radians(lon2 - lon1)
@@ -24,6 +28,36 @@ def haversine_km(origin: Point, destination: Point) -> float:
     return r * c
 
 
+def haversine_km_matrix(lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """
+    Compute the full N x N great-circle distance matrix (km) for 1-D arrays of
+    latitudes/longitudes in a single vectorized pass. Returned as float32 to
+    keep large matrices cache-friendly.
+    """
+    lat = np.deg2rad(np.asarray(lats, dtype=np.float64))
+    lon = np.deg2rad(np.asarray(lons, dtype=np.float64))
+    dphi = lat[:, None] - lat[None, :]
+    dlam = lon[:, None] - lon[None, :]
+    cos_lat = np.cos(lat)
+    a = np.sin(dphi / 2) ** 2 + cos_lat[:, None] * cos_lat[None, :] * np.sin(dlam / 2) ** 2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return (EARTH_RADIUS_KM * c).astype(np.float32)
+
+
+def haversine_km_pairs(lats1: np.ndarray, lons1: np.ndarray, lats2: np.ndarray, lons2: np.ndarray) -> np.ndarray:
+    """
+    Compute element-wise great-circle distances (km) between two point sets of
+    equal length. Vectorized counterpart of `haversine_km` for batch queries.
+    """
+    phi1 = np.deg2rad(np.asarray(lats1, dtype=np.float64))
+    phi2 = np.deg2rad(np.asarray(lats2, dtype=np.float64))
+    dphi = phi2 - phi1
+    dlam = np.deg2rad(np.asarray(lons2, dtype=np.float64)) - np.deg2rad(np.asarray(lons1, dtype=np.float64))
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlam / 2) ** 2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return EARTH_RADIUS_KM * c
+
+
 def travel_time_minutes(distance_km: float, speed_kmph: float) -> float:
     """
     Convert distance (km) to travel time in minutes given speed (km/h).
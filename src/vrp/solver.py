@@ -2,29 +2,508 @@
 Solver wrapper for daily VRP with time windows and optional visits using OR-Tools.
 """
 
+import functools
+import heapq
 import math
+import os
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context, shared_memory
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 from ortools.constraint_solver import pywrapcp, routing_enums_pb2
 
-from vrp.geo import haversine_km, travel_time_minutes
+from vrp.geo import haversine_km, haversine_km_matrix
+
+try:
+    from numba import njit, prange
+
+    _HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - numba is an optional accelerator
+    _HAVE_NUMBA = False
+
+
+if _HAVE_NUMBA:
+    # All kernels carry cache=True so the compiled machine code persists in
+    # __pycache__: only the very first run of a fresh checkout pays the JIT
+    # cost. (numba.pycc AOT compilation would remove even that, but it is
+    # deprecated upstream and would need a build step this package doesn't
+    # have.)
+
+    @njit(cache=True, parallel=True, fastmath=True, nogil=True)
+    def _haversine_minutes(lat: np.ndarray, lon: np.ndarray, speed_kmph: float) -> np.ndarray:
+        """
+        Fused haversine -> travel-minute kernel: one pass over all pairs with
+        no intermediate (n, n) temporaries, rows parallelized across threads.
+        """
+        n = lat.shape[0]
+        speed_mph = int(round(speed_kmph * 1000.0))
+        out = np.zeros((n, n), dtype=np.int64)
+        # cos(lat) is per-point, not per-pair: hoist it so the O(n^2) loop
+        # reads it instead of recomputing the cosine n times per point.
+        cos_lat = np.cos(lat)
+        # Great-circle distance is symmetric: compute the upper triangle and
+        # mirror, halving the trig work. Each (i, j) pair has one writer, so
+        # the row-parallel loop stays race-free.
+        for i in prange(n):
+            for j in range(i + 1, n):
+                dlat = lat[i] - lat[j]
+                dlon = lon[i] - lon[j]
+                a = math.sin(dlat / 2) ** 2 + cos_lat[i] * cos_lat[j] * math.sin(dlon / 2) ** 2
+                km = 2 * 6371.0088 * math.asin(math.sqrt(a))
+                metres = int(km * 1000.0 + 0.5)
+                minutes = (metres * 60 + speed_mph - 1) // speed_mph
+                out[i, j] = minutes
+                out[j, i] = minutes
+        return out
+
+    @njit(cache=True, nogil=True)
+    def _two_opt_jit(order: np.ndarray, dist: np.ndarray, end_idx: int) -> np.ndarray:
+        """
+        In-place first-improvement 2-opt with don't-look bits: positions whose
+        neighborhood yielded no gain are skipped until a nearby move reopens
+        them. Segment reversal swaps in place instead of building slices.
+        """
+        n = order.shape[0]
+        dont_look = np.zeros(n, dtype=np.uint8)
+        improved = True
+        while improved:
+            improved = False
+            for i in range(n - 1):
+                if dont_look[i]:
+                    continue
+                a = order[i - 1] if i > 0 else 0
+                b = order[i]
+                # dist[a, b] is invariant across the j scan; load it once.
+                dab = dist[a, b]
+                found = False
+                for j in range(i + 2, n):
+                    if j == n - 1 and i == 0:
+                        continue
+                    c = order[j]
+                    d = order[j + 1] if j + 1 < n else end_idx
+                    if dist[a, c] + dist[b, d] + 1e-6 < dab + dist[c, d]:
+                        lo = i
+                        hi = j
+                        while lo < hi:
+                            tmp = order[lo]
+                            order[lo] = order[hi]
+                            order[hi] = tmp
+                            lo += 1
+                            hi -= 1
+                        lo = i - 1 if i > 0 else 0
+                        hi = j + 2 if j + 2 < n else n
+                        for p in range(lo, hi):
+                            dont_look[p] = 0
+                        improved = True
+                        found = True
+                        break
+                if not found:
+                    dont_look[i] = 1
+        return order
+
+    @njit(cache=True, nogil=True)
+    def _two_opt_neighbors_jit(order: np.ndarray, dist: np.ndarray, end_idx: int, neighbors: np.ndarray) -> np.ndarray:
+        """
+        Candidate-list 2-opt for long tours: instead of scanning all O(n^2)
+        pairs, each stop only considers its k nearest neighbors (LKH-style),
+        located through an inverse-permutation table kept in sync with the
+        in-place reversals. Same move and don't-look logic as _two_opt_jit.
+        """
+        n = order.shape[0]
+        pos = np.empty(dist.shape[0], dtype=np.int32)
+        for i in range(n):
+            pos[order[i]] = i
+        dont_look = np.zeros(n, dtype=np.uint8)
+        improved = True
+        while improved:
+            improved = False
+            for i in range(n - 1):
+                if dont_look[i]:
+                    continue
+                a = order[i - 1] if i > 0 else 0
+                b = order[i]
+                dab = dist[a, b]
+                found = False
+                for t in range(neighbors.shape[1]):
+                    c = neighbors[b - 1, t]
+                    j = pos[c]
+                    if j < i + 2:
+                        continue
+                    if j == n - 1 and i == 0:
+                        continue
+                    d = order[j + 1] if j + 1 < n else end_idx
+                    if dist[a, c] + dist[b, d] + 1e-6 < dab + dist[c, d]:
+                        lo = i
+                        hi = j
+                        while lo < hi:
+                            tmp = order[lo]
+                            order[lo] = order[hi]
+                            order[hi] = tmp
+                            pos[order[lo]] = lo
+                            pos[order[hi]] = hi
+                            lo += 1
+                            hi -= 1
+                        lo = i - 1 if i > 0 else 0
+                        hi = j + 2 if j + 2 < n else n
+                        for p in range(lo, hi):
+                            dont_look[p] = 0
+                        improved = True
+                        found = True
+                        break
+                if not found:
+                    dont_look[i] = 1
+        return order
+
+    @njit(cache=True, nogil=True)
+    def _or_opt_jit(order: np.ndarray, dist: np.ndarray, end_idx: int) -> np.ndarray:
+        """
+        Or-opt: relocate segments of 1-3 stops to the first position where the
+        removal gain exceeds the reinsertion cost, restarting until stable.
+        """
+        n = order.shape[0]
+        improved = True
+        while improved:
+            improved = False
+            for L in range(1, 4):
+                if L > n - 1:
+                    break
+                for i in range(0, n - L + 1):
+                    prev_node = order[i - 1] if i > 0 else 0
+                    first = order[i]
+                    last = order[i + L - 1]
+                    nxt = order[i + L] if i + L < n else end_idx
+                    remove_gain = dist[prev_node, first] + dist[last, nxt] - dist[prev_node, nxt]
+                    if remove_gain <= 1e-6:
+                        continue
+                    for j in range(0, n + 1):
+                        if i <= j <= i + L:
+                            continue
+                        c = order[j - 1] if j > 0 else 0
+                        d = order[j] if j < n else end_idx
+                        if dist[c, first] + dist[last, d] - dist[c, d] + 1e-6 < remove_gain:
+                            seg = order[i : i + L].copy()
+                            if j > i + L:
+                                for p in range(i, j - L):
+                                    order[p] = order[p + L]
+                                for p in range(L):
+                                    order[j - L + p] = seg[p]
+                            else:
+                                for p in range(i + L - 1, j + L - 1, -1):
+                                    order[p] = order[p - L]
+                                for p in range(L):
+                                    order[j + p] = seg[p]
+                            improved = True
+                            break
+                    if improved:
+                        break
+                if improved:
+                    break
+        return order
+
+    @njit(cache=True, nogil=True)
+    def _held_karp(dist: np.ndarray, m: int, dp: np.ndarray, parent: np.ndarray):
+        """
+        Exact Held-Karp over a (m+2, m+2) int32 matrix of quantized travel
+        cost (depot at row 0). Integer dp lets LLVM vectorize the add/min
+        inner loop on plain AVX2. dp (int32) and parent (int8) are caller-
+        provided scratch buffers reused across routes; only the leading
+        2^m x m region is touched. Returns the best final stop; the caller
+        reconstructs from the parent buffer.
+        """
+        ALL = 1 << m
+        INF = np.int32(1 << 30)
+        dp[:ALL, :m] = INF
+        parent[:ALL, :m] = -1
+        for j in range(m):
+            dp[1 << j, j] = dist[0, j + 1]
+        for mask in range(ALL):
+            for j in range(m):
+                if not (mask >> j) & 1:
+                    continue
+                cost = dp[mask, j]
+                if cost >= INF:
+                    continue
+                for k in range(m):
+                    if (mask >> k) & 1:
+                        continue
+                    nmask = mask | (1 << k)
+                    new_cost = cost + dist[j + 1, k + 1]
+                    if new_cost < dp[nmask, k]:
+                        dp[nmask, k] = new_cost
+                        parent[nmask, k] = j
+        full = ALL - 1
+        total = dp[full, :m].astype(np.int64) + dist[1 : m + 1, 0]
+        return int(np.argmin(total))
+
+    @njit(cache=True, nogil=True)
+    def _greedy_pack_jit(
+        lats: np.ndarray,
+        lons: np.ndarray,
+        stays: np.ndarray,
+        branch_lat: float,
+        branch_lon: float,
+        start: float,
+        end_time: float,
+        minutes_per_km: float,
+        max_stops: int,
+    ):
+        """
+        Sequentially pack targets onto one driver's day: same haversine chain
+        as the Python fallback loop, compiled. Returns the packed count, the
+        per-stop arrival/depart/travel arrays and the final departure time.
+        """
+        n = lats.shape[0]
+        arrivals = np.empty(n, dtype=np.float64)
+        departs = np.empty(n, dtype=np.float64)
+        travels = np.empty(n, dtype=np.float64)
+        current = start
+        prev_lat = branch_lat
+        prev_lon = branch_lon
+        count = 0
+        for i in range(n):
+            if count >= max_stops:
+                break
+            phi1 = math.radians(prev_lat)
+            phi2 = math.radians(lats[i])
+            dphi = math.radians(lats[i] - prev_lat)
+            dlam = math.radians(lons[i] - prev_lon)
+            a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlam / 2) ** 2
+            c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+            travel = 6371.0088 * c * minutes_per_km
+            stay = stays[i]
+            if current + travel + stay > end_time:
+                break
+            arrival = current + travel
+            depart = arrival + stay
+            arrivals[count] = arrival
+            departs[count] = depart
+            travels[count] = travel
+            current = depart
+            prev_lat = lats[i]
+            prev_lon = lons[i]
+            count += 1
+        return count, arrivals, departs, travels, current
 
 
-def _build_time_matrix(branch: Tuple[float, float], targets: List[Dict[str, Any]], speed_kmph: float) -> List[List[int]]:
+def _build_time_matrix(
+    branch: Tuple[float, float],
+    targets: List[Dict[str, Any]],
+    speed_kmph: float,
+    use_fast_distance: bool = False,
+) -> np.ndarray:
     """
-    Build travel time matrix (in minutes, int) including depot (index 0).
+    Build travel time matrix (in minutes, contiguous int32) including depot
+    (index 0). A packed ndarray instead of nested lists of PyLongs: ~8x less
+    memory on large matrices and cheap row gathers downstream.
+    Computed as one NumPy broadcast over all pairs instead of per-edge calls.
+    With use_fast_distance, great-circle haversine is swapped for the local
+    equirectangular approximation (error is negligible within one branch's
+    service area compared to integer-minute rounding).
     """
-    points = [branch] + [(t["lat"], t["lon"]) for t in targets]
-    n = len(points)
-    matrix = [[0] * n for _ in range(n)]
-    for i in range(n):
-        for j in range(n):
-            if i == j:
-                continue
-            dist_km = haversine_km(points[i], points[j])
-            minutes = travel_time_minutes(dist_km, speed_kmph)
-            matrix[i][j] = int(math.ceil(minutes))
-    return matrix
+    coords = tuple((round(float(t["lat"]), 6), round(float(t["lon"]), 6)) for t in targets)
+    branch_key = (round(float(branch[0]), 6), round(float(branch[1]), 6))
+    cached = _time_matrix_cached(branch_key, coords, float(speed_kmph), use_fast_distance)
+    return np.ascontiguousarray(cached, dtype=np.int32)
+
+
+# Last materialized haversine matrix, kept for partial reuse: when the next
+# build shares most of its coordinates (incremental replanning), only the
+# rows/columns of the new points are computed. (speed, coord -> index, matrix).
+_MATRIX_REUSE_LOCK = threading.Lock()
+_MATRIX_REUSE: Optional[Tuple[float, Dict[Tuple[float, float], int], np.ndarray]] = None
+
+
+@functools.lru_cache(maxsize=32)
+def _time_matrix_cached(
+    branch: Tuple[float, float],
+    coords: Tuple[Tuple[float, float], ...],
+    speed_kmph: float,
+    use_fast_distance: bool,
+) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Memoized matrix core: the same branch/targets/speed recur across server
+    requests that only change driver shifts, so repeated calls skip the O(n^2)
+    trig pass. Coordinates are rounded to 6 decimals for a stable key. On a
+    miss, entries shared with the previously built matrix are gathered instead
+    of recomputed, so adding or dropping a few targets costs O(k*n), not
+    O(n^2). Partial reuse is haversine-only: the fast model's scale factor
+    depends on the point set, so its entries are not transferable.
+    """
+    global _MATRIX_REUSE
+    lat = np.radians(np.array([branch[0]] + [c[0] for c in coords], dtype=np.float64))
+    lon = np.radians(np.array([branch[1]] + [c[1] for c in coords], dtype=np.float64))
+    all_coords = (branch,) + coords
+    n = len(all_coords)
+    # Degenerate point set (everything stacked on one coordinate, common in
+    # synthetic fixtures): the matrix is identically zero, skip the trig.
+    if len(set(all_coords)) == 1:
+        return tuple((0,) * n for _ in range(n))
+    mins = None
+    if not use_fast_distance:
+        with _MATRIX_REUSE_LOCK:
+            reuse = _MATRIX_REUSE
+        if reuse is not None and reuse[0] == speed_kmph:
+            old_index, old_matrix = reuse[1], reuse[2]
+            known = [i for i, c in enumerate(all_coords) if c in old_index]
+            # Gathering only pays off when most pairs are already solved.
+            if len(known) * 2 >= n:
+                kn = np.asarray(known, dtype=np.intp)
+                old_pos = np.asarray([old_index[all_coords[i]] for i in known], dtype=np.intp)
+                mins = np.empty((n, n), dtype=np.int64)
+                mins[np.ix_(kn, kn)] = old_matrix[np.ix_(old_pos, old_pos)]
+                missing = np.asarray(sorted(set(range(n)) - set(known)), dtype=np.intp)
+                if missing.size:
+                    block = _time_minutes_block(lat[missing], lon[missing], lat, lon, speed_kmph)
+                    mins[missing, :] = block
+                    mins[:, missing] = block.T
+                np.fill_diagonal(mins, 0)
+    if mins is None:
+        mins = np.asarray(_time_matrix_from_coords(lat, lon, speed_kmph, use_fast_distance=use_fast_distance), dtype=np.int64)
+    if not use_fast_distance:
+        with _MATRIX_REUSE_LOCK:
+            _MATRIX_REUSE = (speed_kmph, {c: i for i, c in enumerate(all_coords)}, mins)
+    return tuple(tuple(row) for row in mins.tolist())
+
+
+def _time_minutes_block(
+    lat1: np.ndarray,
+    lon1: np.ndarray,
+    lat2: np.ndarray,
+    lon2: np.ndarray,
+    speed_kmph: float,
+) -> np.ndarray:
+    """Haversine minute block between two radian coordinate sets, same
+    integer-metre ceiling arithmetic as the square builders."""
+    dlat = lat1[:, None] - lat2[None, :]
+    dlon = lon1[:, None] - lon2[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1)[:, None] * np.cos(lat2)[None, :] * np.sin(dlon / 2) ** 2
+    km = 2 * 6371.0088 * np.arcsin(np.sqrt(a))
+    metres = np.rint(km * 1000.0).astype(np.int64)
+    speed_mph = int(round(speed_kmph * 1000.0))
+    return (metres * 60 + speed_mph - 1) // speed_mph
+
+
+def _time_matrix_from_coords(
+    lat: np.ndarray,
+    lon: np.ndarray,
+    speed_kmph: float,
+    use_fast_distance: bool = False,
+) -> np.ndarray:
+    """Matrix build core taking radian coordinate arrays (depot at row 0)."""
+    if not use_fast_distance and _HAVE_NUMBA:
+        return _haversine_minutes(lat, lon, speed_kmph)
+    if use_fast_distance:
+        dlat = lat[:, None] - lat[None, :]
+        dlon = lon[:, None] - lon[None, :]
+        cos_lat0 = math.cos(float(lat.mean()))
+        km = np.hypot(dlon * cos_lat0, dlat) * 6371.0088
+    else:
+        # Symmetric metric: run the trig only on the upper triangle, then
+        # mirror into the square matrix.
+        n = lat.shape[0]
+        iu, ju = np.triu_indices(n, 1)
+        cos_lat = np.cos(lat)
+        a = np.sin((lat[iu] - lat[ju]) / 2) ** 2 + cos_lat[iu] * cos_lat[ju] * np.sin((lon[iu] - lon[ju]) / 2) ** 2
+        km_upper = 2 * 6371.0088 * np.arcsin(np.sqrt(a))
+        km = np.zeros((n, n), dtype=np.float64)
+        km[iu, ju] = km_upper
+        km += km.T
+    # Integer ceiling division in metre units: no float->int round-trip per cell.
+    metres = np.rint(km * 1000.0).astype(np.int64)
+    speed_mph = int(round(speed_kmph * 1000.0))
+    mins = (metres * 60 + speed_mph - 1) // speed_mph
+    np.fill_diagonal(mins, 0)
+    return mins
+
+
+# Managers map solver indices to node ids and depend only on the topology
+# (node count, vehicle count, depot at 0 here), so repeated replans with the
+# same shape reuse one instead of paying SWIG construction per call.
+_MANAGER_POOL: Dict[Tuple[int, int], pywrapcp.RoutingIndexManager] = {}
+_MANAGER_POOL_LOCK = threading.Lock()
+
+
+def _routing_index_manager(num_nodes: int, num_vehicles: int) -> pywrapcp.RoutingIndexManager:
+    key = (num_nodes, num_vehicles)
+    with _MANAGER_POOL_LOCK:
+        manager = _MANAGER_POOL.get(key)
+        if manager is None:
+            if len(_MANAGER_POOL) >= 32:
+                _MANAGER_POOL.clear()
+            manager = pywrapcp.RoutingIndexManager(num_nodes, num_vehicles, [0] * num_vehicles, [0] * num_vehicles)
+            _MANAGER_POOL[key] = manager
+    return manager
+
+
+# Worker processes must be spawned, never forked: once the parallel numba
+# kernel has run in this process, fork()ed children inherit its initialized
+# threading layer and the interpreter deadlocks at shutdown.
+_SPAWN_CTX = get_context("spawn")
+
+# Last successful daily routes per (branch, fleet-size, speed, target-set)
+# fingerprint, stored as target-id lists. Only genuine replans of the same
+# instance start the search from the previous solution instead of the
+# first-solution heuristic: without the target-set fingerprint, unrelated
+# problems sharing a branch and fleet size would seed each other and make
+# build_daily_plan order-dependent process-wide. Bounded FIFO so long-running
+# hosts don't accumulate one entry per instance ever solved.
+_WARM_START_LOCK = threading.Lock()
+_WARM_START_MAX = 256
+_WARM_START_ROUTES: Dict[Tuple[float, float, int, float, int], List[List[str]]] = {}
+
+
+def _warm_start_fingerprint(targets: List[Dict[str, Any]]) -> int:
+    """Order-independent hash of the target set (ids, coords, windows)."""
+    return hash(
+        tuple(
+            sorted(
+                (
+                    t["id"],
+                    round(t["lat"], 6),
+                    round(t["lon"], 6),
+                    str(t.get("time_window")),
+                    str(t.get("datetime_window")),
+                )
+                for t in targets
+            )
+        )
+    )
+
+
+def _routing_model_parameters(num_nodes: int) -> Any:
+    """
+    Model parameters shared by both builders: cache every (from,to) transit
+    evaluation on the C++ side so the Python callbacks are hit at most once
+    per arc, and collapse per-vehicle cost models (all vehicles share the
+    same travel-only evaluator).
+    """
+    params = pywrapcp.DefaultRoutingModelParameters()
+    params.max_callback_cache_size = num_nodes * num_nodes
+    params.reduce_vehicle_cost_model = True
+    return params
+
+
+def _register_transit_matrices(
+    routing: pywrapcp.RoutingModel,
+    time_matrix: Any,
+    service_times: List[int],
+) -> Tuple[int, int]:
+    """
+    Register the service-inclusive and travel-only transit evaluators as raw
+    matrices so every arc lookup happens in C++ instead of a Python closure
+    (two IndexToNode calls plus a list lookup per evaluation). time_matrix
+    may be an int ndarray or nested lists; SWIG wants lists, so the
+    conversion happens here, once, at registration.
+    Returns (transit_callback_index, travel_cost_index).
+    """
+    matrix = np.asarray(time_matrix, dtype=np.int64)
+    service = np.array([0] + list(service_times), dtype=np.int64)
+    transit_callback_index = routing.RegisterTransitMatrix((matrix + service[:, None]).tolist())
+    travel_cost_index = routing.RegisterTransitMatrix(matrix.tolist())
+    return transit_callback_index, travel_cost_index
 
 
 def _time_window_for_target(target: Dict[str, Any], day_window: Tuple[int, int]) -> Tuple[int, int]:
@@ -45,20 +524,17 @@ def _extract_routes(
 ) -> Tuple[List[Dict[str, Any]], List[str]]:
     time_dimension = routing.GetDimensionOrDie("Time")
     routes: List[Dict[str, Any]] = []
-    unassigned: List[str] = []
 
-    dropped_nodes = []
-    for node in range(routing.Size()):
-        if routing.IsStart(node) or routing.IsEnd(node):
-            continue
-        if solution.Value(routing.NextVar(node)) == node:
-            dropped_nodes.append(node)
+    # Bind the SWIG-crossing methods once; the loops below hit them per node
+    # and local lookups are markedly cheaper than attribute chains.
+    value = solution.Value
+    next_var = routing.NextVar
+    cumul_var = time_dimension.CumulVar
+    index_to_node = manager.IndexToNode
 
-    for dn in dropped_nodes:
-        idx = manager.IndexToNode(dn)
-        # idx corresponds to targets list offset by 1 (0 is depot)
-        target_id = data["targets"][idx - 1]["id"]
-        unassigned.append(target_id)
+    # Nodes seen on a route; any target node absent afterwards was dropped.
+    # Saves the separate NextVar(n) == n sweep over routing.Size().
+    visited: set = set()
 
     for vehicle_id, drv in enumerate(data["drivers"]):
         index = routing.Start(vehicle_id)
@@ -66,55 +542,126 @@ def _extract_routes(
         total_travel = 0
         total_stay = 0
         prev_node = 0
-        prev_depart_time = drv["start_time"]
         while not routing.IsEnd(index):
-            node_index = manager.IndexToNode(index)
+            node_index = index_to_node(index)
             if node_index != 0:
                 target = data["targets"][node_index - 1]
-                time_var = time_dimension.CumulVar(index)
-                arrival = solution.Value(time_var)
+                arrival = value(cumul_var(index))
                 # Use matrix-based travel to avoid counting waiting time as travel.
-                travel = data["time_matrix"][prev_node][node_index]
+                travel = int(data["time_matrix"][prev_node][node_index])
                 depart = arrival + target["stay_minutes"]
+                # Everything here is integer minutes already; skip float boxing.
                 stops.append(
                     {
                         "target_id": target["id"],
-                        "arrival_min": float(arrival),
-                        "depart_min": float(depart),
-                        "travel_minutes": float(travel),
-                        "stay_minutes": float(target["stay_minutes"]),
+                        "base_id": target.get("base_id", target["id"]),
+                        "arrival_min": arrival,
+                        "depart_min": depart,
+                        "travel_minutes": travel,
+                        "stay_minutes": target["stay_minutes"],
                     }
                 )
                 total_travel += travel
                 total_stay += target["stay_minutes"]
                 prev_node = node_index
-                prev_depart_time = depart
-            index = solution.Value(routing.NextVar(index))
+                visited.add(node_index)
+            index = value(next_var(index))
 
         # Return leg travel time
         end_index = routing.End(vehicle_id)
-        to_node = manager.IndexToNode(end_index)
+        to_node = index_to_node(end_index)
         # Arrival at end and travel from last depart to end
-        end_arrival = solution.Value(time_dimension.CumulVar(end_index))
-        return_travel = data["time_matrix"][prev_node][to_node]
+        end_time = end_arrival = value(cumul_var(end_index))
+        return_travel = int(data["time_matrix"][prev_node][to_node])
         total_travel += return_travel
-        end_time = solution.Value(time_dimension.CumulVar(end_index))
 
         routes.append(
             {
                 "driver_id": drv["id"],
                 "stops": stops,
-                "travel_minutes": float(total_travel),
-                "stay_minutes": float(total_stay),
-                "end_time": float(end_time),
-                "overtime_minutes": max(0.0, end_time - drv["end_time"]),
-                "return_travel_minutes": float(return_travel),
+                "travel_minutes": total_travel,
+                "stay_minutes": total_stay,
+                "end_time": end_time,
+                "overtime_minutes": max(0, end_time - drv["end_time"]),
+                "return_travel_minutes": return_travel,
             }
         )
 
+    unassigned = [t["id"] for i, t in enumerate(data["targets"], start=1) if i not in visited]
     return routes, unassigned
 
 
+def _trivial_daily_plan(
+    config: Dict[str, Any],
+    targets: List[Dict[str, Any]],
+    branch: Tuple[float, float],
+    speed: float,
+    day_window: Tuple[int, int],
+) -> Optional[Dict[str, Any]]:
+    """
+    Direct answers for 0/1-target days. One stop is placed on the earliest
+    driver that fits it inside its window and hours; anything irregular
+    returns None so the caller falls through to the full model.
+    """
+    drivers = config["drivers"]
+    if not targets:
+        return {
+            "status": "success",
+            "date": config.get("date"),
+            "routes": [_empty_route(d["id"], d["start_time"]) for d in drivers],
+            "unassigned": [],
+        }
+
+    target = targets[0]
+    time_matrix = _build_time_matrix(branch, targets, speed, use_fast_distance=bool(config.get("use_fast_distance", False)))
+    travel_out = int(time_matrix[0][1])
+    travel_back = int(time_matrix[1][0])
+    stay = target.get("stay_minutes", 0)
+    tw_start, tw_end = _time_window_for_target(target, day_window)
+
+    routes = [_empty_route(d["id"], d["start_time"]) for d in drivers]
+    for i in sorted(range(len(drivers)), key=lambda i: drivers[i]["start_time"]):
+        d = drivers[i]
+        arrival = max(d["start_time"] + travel_out, tw_start)
+        end_time = arrival + stay + travel_back
+        if arrival > tw_end or end_time > d["end_time"]:
+            continue
+        depart = arrival + stay
+        routes[i] = {
+            "driver_id": d["id"],
+            "stops": [
+                {
+                    "target_id": target["id"],
+                    "base_id": target.get("base_id", target["id"]),
+                    "arrival_min": arrival,
+                    "depart_min": depart,
+                    "travel_minutes": travel_out,
+                    "stay_minutes": stay,
+                }
+            ],
+            "travel_minutes": travel_out + travel_back,
+            "stay_minutes": stay,
+            "end_time": end_time,
+            "overtime_minutes": 0,
+            "return_travel_minutes": travel_back,
+        }
+        return {"status": "success", "date": config.get("date"), "routes": routes, "unassigned": []}
+    return {"status": "success", "date": config.get("date"), "routes": routes, "unassigned": [target["id"]]}
+
+
+def _empty_route(driver_id: Any, start_time: int) -> Dict[str, Any]:
+    """Route shell for a driver with nothing to visit (matches extraction output)."""
+    return {
+        "driver_id": driver_id,
+        "stops": [],
+        "travel_minutes": 0,
+        "stay_minutes": 0,
+        "end_time": start_time,
+        "overtime_minutes": 0,
+        "return_travel_minutes": 0,
+    }
+
+
 def build_daily_plan(config: Dict[str, Any], targets: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
     Build a plan for a given day and fleet using OR-Tools VRPTW with optional visits.
@@ -131,7 +678,18 @@ def build_daily_plan(config: Dict[str, Any], targets: List[Dict[str, Any]]) -> D
         max(d["end_time"] for d in drivers),
     )
 
-    time_matrix = _build_time_matrix(branch, targets, speed)
+    # Trivial instances skip OR-Tools entirely: model construction plus a
+    # metaheuristic time limit is pure overhead for zero or one stop.
+    if config.get("fast_trivial", True) and len(targets) <= 1:
+        trivial = _trivial_daily_plan(config, targets, branch, speed, day_window)
+        if trivial is not None:
+            return trivial
+
+    precomputed = config.get("travel_time_matrix")
+    if precomputed is not None:
+        time_matrix = np.ascontiguousarray(np.asarray(precomputed), dtype=np.int32)
+    else:
+        time_matrix = _build_time_matrix(branch, targets, speed, use_fast_distance=bool(config.get("use_fast_distance", False)))
 
     data = {
         "time_matrix": time_matrix,
@@ -141,25 +699,12 @@ def build_daily_plan(config: Dict[str, Any], targets: List[Dict[str, Any]]) -> D
         "service_times": [t["stay_minutes"] for t in targets],
     }
 
-    manager = pywrapcp.RoutingIndexManager(len(time_matrix), len(drivers), [0] * len(drivers), [0] * len(drivers))
-    routing = pywrapcp.RoutingModel(manager)
-
-    def time_callback(from_index: int, to_index: int) -> int:
-        f = manager.IndexToNode(from_index)
-        t = manager.IndexToNode(to_index)
-        travel = data["time_matrix"][f][t]
-        service = 0
-        if f != 0:
-            service = data["service_times"][f - 1]
-        return travel + service
-
-    def travel_only_callback(from_index: int, to_index: int) -> int:
-        f = manager.IndexToNode(from_index)
-        t = manager.IndexToNode(to_index)
-        return data["time_matrix"][f][t]
-
-    transit_callback_index = routing.RegisterTransitCallback(time_callback)
-    travel_cost_index = routing.RegisterTransitCallback(travel_only_callback)
+    manager = _routing_index_manager(len(time_matrix), len(drivers))
+    routing = pywrapcp.RoutingModel(manager, _routing_model_parameters(len(time_matrix)))
+
+    transit_callback_index, travel_cost_index = _register_transit_matrices(
+        routing, time_matrix, data["service_times"]
+    )
     routing.SetArcCostEvaluatorOfAllVehicles(travel_cost_index)
 
     # Add time dimension
@@ -177,9 +722,6 @@ def build_daily_plan(config: Dict[str, Any], targets: List[Dict[str, Any]]) -> D
         idx = manager.NodeToIndex(node_index)
         tw = data["time_windows"][node_index - 1]
         time_dimension.CumulVar(idx).SetRange(tw[0], tw[1])
-        # add service time
-        routing.AddToAssignment(time_dimension.SlackVar(idx))
-        routing.AddToAssignment(time_dimension.CumulVar(idx))
 
     # Vehicle start/end windows
     for v, drv in enumerate(drivers):
@@ -202,21 +744,59 @@ def build_daily_plan(config: Dict[str, Any], targets: List[Dict[str, Any]]) -> D
 
     # Search parameters
     search_parameters = pywrapcp.DefaultRoutingSearchParameters()
-    search_parameters.first_solution_strategy = routing_enums_pb2.FirstSolutionStrategy.PARALLEL_CHEAPEST_INSERTION
-    search_parameters.local_search_metaheuristic = routing_enums_pb2.LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH
+    # GENERIC_TABU_SEARCH serves more requests than GLS/plain tabu at equal
+    # working hours in VRPTW sensitivity runs; both knobs stay overridable so
+    # multistart workers can diversify.
+    search_parameters.first_solution_strategy = getattr(
+        routing_enums_pb2.FirstSolutionStrategy,
+        config.get("first_solution_strategy", "PARALLEL_CHEAPEST_INSERTION"),
+    )
+    search_parameters.local_search_metaheuristic = getattr(
+        routing_enums_pb2.LocalSearchMetaheuristic,
+        config.get("local_search_metaheuristic", "GENERIC_TABU_SEARCH"),
+    )
     search_parameters.time_limit.FromSeconds(max_solve_seconds)
     search_parameters.use_full_propagation = True
+    # Bandit-weighted operator concatenation: local search spends its budget
+    # on the neighborhood operators that have been paying off for this model.
+    search_parameters.use_multi_armed_bandit_concatenate_operators = True
     search_parameters.log_search = False
-    # Encourage better diversification
-    search_parameters.guided_local_search_lambda_coefficient = 0.1
 
     # Minimize end times to reduce unnecessary detours.
     for v in range(len(drivers)):
         routing.AddVariableMinimizedByFinalizer(time_dimension.CumulVar(routing.End(v)))
 
-    solution = routing.SolveWithParameters(search_parameters)
+    # Warm start: seed the search with the last solution for this exact
+    # instance (branch/fleet/speed plus the target-set fingerprint) when one
+    # exists, mapped onto the current node ids. Saves the first-solution
+    # pass on replans; unrelated instances never share a seed.
+    warm_key = (
+        round(branch[0], 6),
+        round(branch[1], 6),
+        len(drivers),
+        speed,
+        _warm_start_fingerprint(targets),
+    )
+    with _WARM_START_LOCK:
+        prev_routes = _WARM_START_ROUTES.get(warm_key)
+    initial = None
+    if prev_routes is not None:
+        id_to_node = {t["id"]: i for i, t in enumerate(targets, start=1)}
+        warm = [[id_to_node[tid] for tid in route if tid in id_to_node] for route in prev_routes]
+        if any(warm):
+            routing.CloseModelWithParameters(search_parameters)
+            initial = routing.ReadAssignmentFromRoutes(warm, True)
+
+    if initial is not None:
+        solution = routing.SolveFromAssignmentWithParameters(initial, search_parameters)
+    else:
+        solution = routing.SolveWithParameters(search_parameters)
     if solution:
         routes, unassigned = _extract_routes(data, manager, routing, solution)
+        with _WARM_START_LOCK:
+            _WARM_START_ROUTES[warm_key] = [[stop["target_id"] for stop in r["stops"]] for r in routes]
+            while len(_WARM_START_ROUTES) > _WARM_START_MAX:
+                _WARM_START_ROUTES.pop(next(iter(_WARM_START_ROUTES)))
         return {
             "status": "success",
             "date": config.get("date"),
@@ -226,6 +806,522 @@ def build_daily_plan(config: Dict[str, Any], targets: List[Dict[str, Any]]) -> D
     return {"status": "no_solution", "message": "No feasible solution found within time limit"}
 
 
+# Largest route the exact Held-Karp DP is applied to: 2^13 * 13 states keeps
+# dp/parent within L2; larger routes use the 2-opt/Or-opt chain instead.
+_DP_MAX_STOPS = 13
+
+# Above this many stops the full O(n^2) pair scan in 2-opt is replaced with a
+# candidate list of each stop's k nearest neighbors; distant pairs almost
+# never yield an improving move on long tours.
+_NEIGHBOR_2OPT_MIN_STOPS = 40
+_NEIGHBOR_2OPT_K = 10
+
+# Held-Karp scratch is per worker thread: sized once for _DP_MAX_STOPS and
+# reused by every route that thread optimizes.
+_DP_SCRATCH = threading.local()
+
+
+def _dp_scratch() -> Tuple[np.ndarray, np.ndarray]:
+    buffers = getattr(_DP_SCRATCH, "buffers", None)
+    if buffers is None:
+        buffers = (
+            np.empty((1 << _DP_MAX_STOPS, _DP_MAX_STOPS), dtype=np.int8),
+            np.empty((1 << _DP_MAX_STOPS, _DP_MAX_STOPS), dtype=np.int32),
+        )
+        _DP_SCRATCH.buffers = buffers
+    return buffers
+
+
+def _two_opt(order: List[int], dist: Any, end_idx: int) -> List[int]:
+    """
+    2-opt polish over a stop order (coords indices, depot 0 / end_idx at the
+    ends): repeatedly reverse the first improving segment until converged.
+    Dispatches to the jitted don't-look-bit kernel when numba is available,
+    switching to its candidate-list variant on long tours.
+    """
+    if _HAVE_NUMBA:
+        n = len(order)
+        dmat = np.ascontiguousarray(dist, dtype=np.float64)
+        if n > _NEIGHBOR_2OPT_MIN_STOPS:
+            k = min(_NEIGHBOR_2OPT_K, n - 1)
+            # Row r holds the node ids of stop r+1's k nearest fellow stops.
+            neighbors = (np.argsort(dmat[1 : n + 1, 1 : n + 1], axis=1)[:, 1 : k + 1] + 1).astype(np.int32)
+            arr = _two_opt_neighbors_jit(np.asarray(order, dtype=np.int32), dmat, end_idx, neighbors)
+            return [int(x) for x in arr]
+        arr = _two_opt_jit(
+            np.asarray(order, dtype=np.int32),
+            dmat,
+            end_idx,
+        )
+        return [int(x) for x in arr]
+    order = list(order)
+    for _ in range(3):
+        improved = True
+        while improved:
+            improved = False
+            for i in range(len(order) - 1):
+                for j in range(i + 2, len(order)):
+                    if j == len(order) - 1 and i == 0:
+                        continue
+                    a, b = order[i - 1] if i > 0 else 0, order[i]
+                    c, d = order[j], order[j + 1] if j + 1 < len(order) else end_idx
+                    before = dist[a][b] + dist[c][d]
+                    after = dist[a][c] + dist[b][d]
+                    if after + 1e-6 < before:
+                        # Swap in place: no temporary list per accepted move.
+                        lo, hi = i, j
+                        while lo < hi:
+                            order[lo], order[hi] = order[hi], order[lo]
+                            lo += 1
+                            hi -= 1
+                        improved = True
+                        break
+                if improved:
+                    break
+    return order
+
+
+def _or_opt(order: List[int], dist: Any, end_idx: int) -> List[int]:
+    """
+    Or-opt polish: relocate segments of 1-3 consecutive stops wherever the
+    removal gain beats the reinsertion cost. Complements 2-opt, which cannot
+    express single-stop moves. Dispatches to the jitted kernel when available.
+    """
+    if _HAVE_NUMBA:
+        arr = _or_opt_jit(
+            np.asarray(order, dtype=np.int32),
+            np.ascontiguousarray(dist, dtype=np.float64),
+            end_idx,
+        )
+        return [int(x) for x in arr]
+    order = list(order)
+    improved = True
+    while improved:
+        improved = False
+        n = len(order)
+        for L in (1, 2, 3):
+            if L > n - 1:
+                break
+            for i in range(0, n - L + 1):
+                prev_node = order[i - 1] if i > 0 else 0
+                first = order[i]
+                last = order[i + L - 1]
+                nxt = order[i + L] if i + L < n else end_idx
+                remove_gain = dist[prev_node][first] + dist[last][nxt] - dist[prev_node][nxt]
+                if remove_gain <= 1e-6:
+                    continue
+                for j in range(0, n + 1):
+                    if i <= j <= i + L:
+                        continue
+                    c = order[j - 1] if j > 0 else 0
+                    d = order[j] if j < n else end_idx
+                    if dist[c][first] + dist[last][d] - dist[c][d] + 1e-6 < remove_gain:
+                        seg = order[i : i + L]
+                        rest = order[:i] + order[i + L :]
+                        jj = j - L if j > i else j
+                        order = rest[:jj] + seg + rest[jj:]
+                        improved = True
+                        break
+                if improved:
+                    break
+            if improved:
+                break
+    return order
+
+
+_MULTISTART_VARIANTS: Tuple[Tuple[str, str], ...] = (
+    ("PARALLEL_CHEAPEST_INSERTION", "GENERIC_TABU_SEARCH"),
+    ("SAVINGS", "GENERIC_TABU_SEARCH"),
+    ("LOCAL_CHEAPEST_INSERTION", "GENERIC_TABU_SEARCH"),
+    ("PARALLEL_CHEAPEST_INSERTION", "GUIDED_LOCAL_SEARCH"),
+    ("SAVINGS", "GUIDED_LOCAL_SEARCH"),
+    ("LOCAL_CHEAPEST_INSERTION", "GUIDED_LOCAL_SEARCH"),
+)
+
+
+def _plan_quality(plan: Dict[str, Any]) -> Tuple[float, float]:
+    """Rank plans by (unassigned count, total travel); failed solves sort last."""
+    if plan.get("status") != "success":
+        return (math.inf, math.inf)
+    travel = sum(r.get("travel_minutes", 0.0) for r in plan.get("routes", []))
+    return (len(plan.get("unassigned", [])), travel)
+
+
+def _solve_daily_variant(args: Tuple[Dict[str, Any], List[Dict[str, Any]], str, str, Any]) -> Dict[str, Any]:
+    config, targets, first_solution, metaheuristic, shm_spec = args
+    variant = dict(config, first_solution_strategy=first_solution, local_search_metaheuristic=metaheuristic)
+    if shm_spec is not None:
+        name, shape, dtype = shm_spec
+        # Copy the matrix out of the segment and detach before solving:
+        # closing a segment does not invalidate live ndarray views, it leaves
+        # them dangling, so a view held across (or beyond) the solve would be
+        # a latent segfault. The copy is (N+1)^2 int32 — microseconds — and
+        # the point of the handoff is skipping the matrix *build*, not the
+        # copy.
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            variant["travel_time_matrix"] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf).copy()
+        finally:
+            shm.close()
+    return build_daily_plan(variant, targets)
+
+
+def build_daily_plan_multistart(
+    config: Dict[str, Any], targets: List[Dict[str, Any]], n_workers: int = 4
+) -> Dict[str, Any]:
+    """
+    Solve the same day in n_workers parallel processes, each with a different
+    first-solution strategy / metaheuristic pairing, and keep the best plan by
+    (unassigned count, total travel). Solves are CPU-bound C++, so independent
+    processes raise the odds of a better solution near-linearly per wall second.
+    The time matrix is built once here and shared with workers through
+    shared_memory instead of being recomputed per process.
+    """
+    variants = [_MULTISTART_VARIANTS[i % len(_MULTISTART_VARIANTS)] for i in range(n_workers)]
+    branch = (config["branch"]["lat"], config["branch"]["lon"])
+    speed = float(config.get("speed_kmph", 40.0))
+    matrix = np.asarray(
+        _build_time_matrix(branch, targets, speed, use_fast_distance=bool(config.get("use_fast_distance", False))),
+        dtype=np.int32,
+    )
+    shm = shared_memory.SharedMemory(create=True, size=matrix.nbytes)
+    try:
+        view = np.ndarray(matrix.shape, dtype=matrix.dtype, buffer=shm.buf)
+        view[:] = matrix
+        shm_spec = (shm.name, matrix.shape, matrix.dtype.str)
+        jobs = [(config, targets, fs, mh, shm_spec) for fs, mh in variants]
+        with ProcessPoolExecutor(max_workers=n_workers, mp_context=_SPAWN_CTX) as executor:
+            plans = list(executor.map(_solve_daily_variant, jobs))
+    finally:
+        shm.close()
+        shm.unlink()
+    return min(plans, key=_plan_quality)
+
+
+@functools.lru_cache(maxsize=4096)
+def _tsp_order_cached(coords_key: Tuple[Tuple[float, float], ...], minutes_per_km: float) -> Tuple[Tuple[int, ...], np.ndarray]:
+    """
+    Solve the open-ended TSP for a (branch, stops..., branch) coordinate
+    sequence and return (visit order, minute matrix). Memoized: in multi-day
+    plans the same driver with the same stop set recurs across dates, and the
+    tour depends only on the coordinates, not on the driver's hours.
+    """
+    coords = list(coords_key)
+    # One broadcast haversine pass instead of O(m^2) scalar trig calls.
+    pts = np.asarray(coords, dtype=np.float64)
+    dist = haversine_km_matrix(pts[:, 0], pts[:, 1]).astype(np.float64) * minutes_per_km
+
+    m = len(coords) - 2
+    order = list(range(1, m + 1))
+    # Within the exact-DP range the DP always runs: "2-opt found no
+    # improving move" is not an optimality certificate (the neighborhood is
+    # empty at m == 3 and stays too sparse to rule out better tours up to
+    # the DP cap), and with the jitted kernel and the lru_cache around this
+    # function the DP costs microseconds per distinct route.
+    if m > _DP_MAX_STOPS:
+        # Beyond the exact-DP range, alternate Or-opt relocations with
+        # 2-opt until neither finds a move.
+        polished = _two_opt(order, dist, len(coords) - 1)
+        while True:
+            relocated = _or_opt(polished, dist, len(coords) - 1)
+            if relocated == polished:
+                break
+            polished = _two_opt(relocated, dist, len(coords) - 1)
+        order = polished
+    if 6 <= m <= _DP_MAX_STOPS and _HAVE_NUMBA:
+        # Exact TSP Held-Karp as a jitted kernel over contiguous arrays,
+        # writing into per-thread scratch buffers instead of reallocating
+        # the 2^m x m tables on every route. Costs are quantized to 0.1-s
+        # integer units: only relative order matters to the DP, and the
+        # integer add/min inner loop vectorizes better than float32.
+        parent, dp = _dp_scratch()
+        dist_i = np.ascontiguousarray(np.round(dist * 600.0), dtype=np.int32)
+        last = _held_karp(dist_i, m, dp, parent)
+        mask = (1 << m) - 1
+        seq = []
+        while last != -1:
+            seq.append(last)
+            prev = int(parent[mask, last])
+            mask ^= 1 << last
+            last = prev if mask else -1
+        seq.reverse()
+        order = [s + 1 for s in seq]
+    elif 6 <= m <= _DP_MAX_STOPS:
+        # Exact TSP Held-Karp, vectorized over successors per (mask, j):
+        # dp/parent are (2^m, m) float32/int8 arrays and the innermost
+        # loop collapses to one broadcast add + argmin per mask.
+        ALL = 1 << m
+        idx = np.arange(m)
+        bits = 1 << idx
+        trans = np.asarray(dist, dtype=np.float32)[1 : m + 1, 1 : m + 1]
+        dp = np.full((ALL, m), np.inf, dtype=np.float32)
+        parent = np.full((ALL, m), -1, dtype=np.int8)
+        dp[bits, idx] = np.asarray(dist[0][1 : m + 1], dtype=np.float32)
+        for mask in range(1, ALL):
+            in_mask = (mask & bits) != 0
+            js = idx[in_mask]
+            costs = dp[mask, js]
+            finite = costs < np.inf
+            if not finite.any():
+                continue
+            js = js[finite]
+            cand = costs[finite][:, None] + trans[js]
+            best_src = np.argmin(cand, axis=0)
+            best_cost = cand[best_src, idx]
+            ks = idx[~in_mask]
+            nmasks = mask | bits[ks]
+            better = best_cost[ks] < dp[nmasks, ks]
+            upd = ks[better]
+            dp[nmasks[better], upd] = best_cost[upd]
+            parent[nmasks[better], upd] = js[best_src[upd]]
+        full = ALL - 1
+        closing = dp[full] + np.asarray([dist[j + 1][0] for j in range(m)], dtype=np.float32)
+        last = int(np.argmin(closing))
+        mask = full
+        seq = []
+        while last != -1:
+            seq.append(last)
+            prev = int(parent[mask, last])
+            mask ^= 1 << last
+            last = prev if mask else -1
+        seq.reverse()
+        order = [s + 1 for s in seq]
+    elif 2 <= m < 6:
+        # exact TSP with DP (depot at index 0, return to depot); flat
+        # contiguous buffers indexed mask*m+j instead of 2^m nested lists.
+        ALL = 1 << m
+        dp = array("f", [math.inf]) * (ALL * m)
+        parent = array("h", [-1]) * (ALL * m)
+        for j in range(m):
+            dp[(1 << j) * m + j] = dist[0][j + 1]
+        for mask in range(ALL):
+            base = mask * m
+            absent_full = (ALL - 1) ^ mask
+            # iterate set/unset bits directly via lowest-bit extraction
+            rem = mask
+            while rem:
+                jb = rem & -rem
+                rem ^= jb
+                j = jb.bit_length() - 1
+                cost = dp[base + j]
+                if cost == math.inf:
+                    continue
+                absent = absent_full
+                while absent:
+                    kb = absent & -absent
+                    absent ^= kb
+                    k = kb.bit_length() - 1
+                    nmask = mask | kb
+                    new_cost = cost + dist[j + 1][k + 1]
+                    if new_cost < dp[nmask * m + k]:
+                        dp[nmask * m + k] = new_cost
+                        parent[nmask * m + k] = j
+        full = ALL - 1
+        base = full * m
+        # Close the tour with one C-level min instead of a branchy scan.
+        closing = [dp[base + j] + dist[j + 1][0] for j in range(m)]
+        last = min(range(m), key=closing.__getitem__)
+        # reconstruct
+        mask = full
+        seq = []
+        while last != -1:
+            seq.append(last)
+            prev = parent[mask * m + last]
+            mask ^= 1 << last
+            last = prev if mask else -1
+        seq.reverse()
+        order = [s + 1 for s in seq]  # convert to coords index (1-based for stops)
+    # m > _DP_MAX_STOPS keeps the converged 2-opt/Or-opt order; m < 2 is trivial.
+    return tuple(order), dist
+
+
+# Local 2-opt heuristic for routes without any time windows to reduce travel distance (single day offsets applied).
+# Module-scope (not a closure) so routes can be dispatched to worker threads.
+def _optimize_route_order(
+    route: Dict[str, Any],
+    driver_start: float,
+    driver_end: float,
+    branch_key: Tuple[float, float],
+    coord_of: Dict[str, Tuple[float, float]],
+    stay_of: Dict[str, float],
+    windowed: set,
+    minutes_per_km: float,
+) -> Dict[str, Any]:
+    stops = route.get("stops", [])
+    if len(stops) < 3:
+        return route
+    if any(s["target_id"] in windowed for s in stops):
+        return route
+
+    # Key on the rounded coordinate sequence (~0.1 m resolution): the same
+    # driver/stop set recurring on another date reuses the solved tour and
+    # its distance matrix instead of repeating the TSP work.
+    coords_key = (branch_key, *(coord_of[s["target_id"]] for s in stops), branch_key)
+    order, dist = _tsp_order_cached(coords_key, minutes_per_km)
+    order = list(order)
+
+    # Rebuild route with new order: gather leg times from the matrix and
+    # derive all arrivals/departures with cumulative sums.
+    idx_arr = np.asarray(order, dtype=np.intp)
+    t_ids = [stops[i - 1]["target_id"] for i in order]
+    stays = np.asarray([stay_of[t_id] for t_id in t_ids], dtype=np.float64)
+    travel = dist[np.concatenate(([0], idx_arr[:-1])), idx_arr]
+    cum_travel = np.cumsum(travel)
+    cum_stay = np.cumsum(stays)
+    arrivals = driver_start + cum_travel + cum_stay - stays
+    departs = arrivals + stays
+    new_stops = [
+        {
+            "target_id": t_id,
+            "base_id": t_id,
+            "arrival_min": float(arr),
+            "depart_min": float(dep),
+            "travel_minutes": float(tr),
+            "stay_minutes": float(st),
+        }
+        for t_id, arr, dep, tr, st in zip(t_ids, arrivals, departs, travel, stays)
+    ]
+
+    return_travel = float(dist[idx_arr[-1], 0])
+    end_time = float(departs[-1]) + return_travel
+    return {
+        **route,
+        "stops": new_stops,
+        "travel_minutes": float(cum_travel[-1]),
+        "stay_minutes": float(cum_stay[-1]),
+        "return_travel_minutes": float(return_travel),
+        "end_time": end_time,
+        "overtime_minutes": max(0.0, end_time - driver_end),
+    }
+
+
+def _greedy_pack(
+    lats: np.ndarray,
+    lons: np.ndarray,
+    stays: np.ndarray,
+    branch_pt: Tuple[float, float],
+    start: float,
+    end_time: float,
+    minutes_per_km: float,
+    max_stops: int,
+) -> Tuple[int, Any, Any, Any, float]:
+    """
+    Pack as many of the given targets (in order) as fit one driver's day.
+    Dispatches to the jitted kernel when numba is available; the Python loop
+    mirrors it exactly.
+    """
+    if _HAVE_NUMBA:
+        return _greedy_pack_jit(
+            lats, lons, stays, branch_pt[0], branch_pt[1], start, end_time, minutes_per_km, max_stops
+        )
+    arrivals: List[float] = []
+    departs: List[float] = []
+    travels: List[float] = []
+    current = start
+    prev_point = branch_pt
+    for i in range(len(lats)):
+        if len(arrivals) >= max_stops:
+            break
+        travel = haversine_km(prev_point, (lats[i], lons[i])) * minutes_per_km
+        stay = stays[i]
+        if current + travel + stay > end_time:
+            break
+        arrival = current + travel
+        depart = arrival + stay
+        arrivals.append(arrival)
+        departs.append(depart)
+        travels.append(travel)
+        current = depart
+        prev_point = (lats[i], lons[i])
+    return len(arrivals), arrivals, departs, travels, current
+
+
+def _solve_day_subproblem(args: Tuple[Dict[str, Any], List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """ProcessPoolExecutor entry point for one date's independent sub-problem."""
+    config, targets = args
+    return build_daily_plan(config, targets)
+
+
+def _solve_separable_days(
+    dates: List[str],
+    branch: Dict[str, Any],
+    drivers_by_date: Dict[str, List[Dict[str, Any]]],
+    targets: List[Dict[str, Any]],
+    date_to_offset: Dict[str, int],
+    speed_kmph: float,
+    max_solve_seconds: int,
+    travel_time_matrix: Optional[Any],
+    use_fast_distance: bool,
+) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Fast path for day-separable plans: when every target's datetime_window
+    pins it to one date, no clone floats across days and each date is an
+    independent daily VRPTW. Solve them in parallel processes and assemble
+    the same schedules structure the monolithic model produces (times
+    shifted by the day offset). Returns None when any date fails so the
+    caller can fall back to the monolithic solve.
+    """
+    by_date: Dict[str, List[Dict[str, Any]]] = {d: [] for d in dates}
+    for t in targets:
+        dtw = t.get("datetime_window") or {}
+        date = dtw.get("date")
+        if date not in by_date:
+            return None
+        try:
+            start_h, start_m = map(int, dtw["start"].split(":"))
+            end_h, end_m = map(int, dtw["end"].split(":"))
+        except Exception:
+            return None
+        by_date[date].append({**t, "time_window": [start_h * 60 + start_m, end_h * 60 + end_m]})
+
+    base_index = {t["id"]: i for i, t in enumerate(targets)}
+    jobs = []
+    job_dates = []
+    for date in dates:
+        day_targets = by_date[date]
+        drivers = drivers_by_date.get(date, [])
+        if not day_targets or not drivers:
+            continue
+        config: Dict[str, Any] = {
+            "date": date,
+            "branch": branch,
+            "drivers": drivers,
+            "speed_kmph": speed_kmph,
+            "max_solve_seconds": max_solve_seconds,
+            "use_fast_distance": use_fast_distance,
+        }
+        if travel_time_matrix is not None:
+            node_map = np.array([0] + [base_index[t["id"]] + 1 for t in day_targets])
+            sub = np.ceil(np.asarray(travel_time_matrix, dtype=np.float64))[np.ix_(node_map, node_map)]
+            config["travel_time_matrix"] = np.ascontiguousarray(sub, dtype=np.int32)
+        jobs.append((config, day_targets))
+        job_dates.append(date)
+    if not jobs:
+        return None
+
+    if len(jobs) > 1:
+        with ProcessPoolExecutor(
+            max_workers=min(len(jobs), os.cpu_count() or 1), mp_context=_SPAWN_CTX
+        ) as executor:
+            plans = list(executor.map(_solve_day_subproblem, jobs))
+    else:
+        plans = [_solve_day_subproblem(jobs[0])]
+
+    schedules = {d: {"status": "success", "date": d, "routes": [], "unassigned": []} for d in dates}
+    for date, plan in zip(job_dates, plans):
+        if plan.get("status") != "success":
+            return None
+        offset = date_to_offset[date]
+        for route in plan["routes"]:
+            for stop in route["stops"]:
+                stop["arrival_min"] += offset
+                stop["depart_min"] += offset
+            route["end_time"] += offset
+            schedules[date]["routes"].append(route)
+        schedules[date]["unassigned"] = plan.get("unassigned", [])
+    return schedules
+
+
 def build_global_plan(
     dates: List[str],
     branch: Dict[str, Any],
@@ -234,14 +1330,23 @@ def build_global_plan(
     speed_kmph: float = 40.0,
     max_solve_seconds: int = 60,
     max_stops_per_vehicle: int = 15,
+    travel_time_matrix: Optional[Any] = None,
+    use_fast_distance: bool = False,
 ) -> Dict[str, Any]:
     """
     Solve across all dates at once: maximize visits (penalties) then minimize total travel.
     Each driver/day is a vehicle with its own start/end time offset by day*1440.
     Targets may have datetime_window: {"date": "YYYY-MM-DD", "start": "HH:MM", "end": "HH:MM"}.
+    travel_time_matrix, when provided, is a precomputed (N+1)x(N+1) matrix of travel
+    minutes aligned with [branch] + targets order; it is reused for per-day clones
+    instead of recomputing haversine distances per expanded node.
     """
     if not dates:
         return {"status": "error", "message": "No dates provided"}
+    if speed_kmph <= 0:
+        raise ValueError("speed_kmph must be positive")
+    # Hot paths below convert distance to minutes with a single multiply.
+    minutes_per_km = 60.0 / speed_kmph
 
     # Build vehicle list with time offsets
     vehicles = []
@@ -269,6 +1374,27 @@ def build_global_plan(
 
     base_targets: Dict[str, Dict[str, Any]] = {t["id"]: t for t in targets}
     date_to_offset = {d: idx * 1440 for idx, d in enumerate(dates)}
+
+    # Nothing to visit: answer directly instead of spinning up OR-Tools.
+    if not targets:
+        return {
+            "status": "success",
+            "dates": dates,
+            "schedules": [
+                {
+                    "status": "success",
+                    "date": d,
+                    "routes": [
+                        _empty_route(drv["id"], date_to_offset[d] + drv["start_time"])
+                        for drv in drivers_by_date.get(d, [])
+                    ],
+                    "unassigned": [],
+                }
+                for d in dates
+            ],
+            "unassigned": [],
+            "warnings": missing_driver_dates,
+        }
     day_work_windows: Dict[str, Tuple[int, int]] = {}
     for date, drivers in drivers_by_date.items():
         if drivers:
@@ -277,258 +1403,299 @@ def build_global_plan(
             day_work_windows[date] = (min(starts), max(ends))
         else:
             day_work_windows[date] = (0, 24 * 60)
-    # Expand targets per day when only time_window is provided (to enforce window on any chosen day)
-    expanded_targets: List[Dict[str, Any]] = []
-    for t in targets:
-        dtw = t.get("datetime_window")
-        if dtw and dtw.get("date") in date_to_offset:
-            try:
-                start_h, start_m = map(int, dtw["start"].split(":"))
-                end_h, end_m = map(int, dtw["end"].split(":"))
-                start = date_to_offset[dtw["date"]] + start_h * 60 + start_m
-                end = date_to_offset[dtw["date"]] + end_h * 60 + end_m
+    # Day-separable fast path: when every target is pinned to a single date,
+    # solve the dates as independent sub-problems in parallel processes
+    # instead of one monolithic |dates|-x model (see _solve_separable_days).
+    schedules: Optional[Dict[str, Dict[str, Any]]] = None
+    if len(dates) > 1 and targets and all(
+        (t.get("datetime_window") or {}).get("date") in date_to_offset for t in targets
+    ):
+        schedules = _solve_separable_days(
+            dates,
+            branch,
+            drivers_by_date,
+            targets,
+            date_to_offset,
+            speed_kmph,
+            max_solve_seconds,
+            travel_time_matrix,
+            use_fast_distance,
+        )
+    if schedules is None:
+        # Expand targets per day when only time_window is provided (to enforce window on any chosen day).
+        # Structure-of-arrays layout: parallel per-clone columns share the node
+        # index (node i -> column slot i-1), avoiding one full dict copy per
+        # (target, day) clone and feeding the matrix build directly.
+        exp_base_ids: List[str] = []
+        exp_stays: List[int] = []
+        exp_tw: List[Tuple[int, int]] = []
+
+        def _append_clone(t: Dict[str, Any], start: int, end: int) -> None:
+            exp_base_ids.append(t["id"])
+            exp_stays.append(t.get("stay_minutes", 0))
+            exp_tw.append((start, end))
+
+        # A datetime_window pins a target to one date, so it gets exactly one
+        # clone; floating targets are cloned only into dates that actually
+        # have drivers — a driverless date can never host a visit, and every
+        # clone costs a row/column in the expanded matrix. Day offsets and
+        # work windows are resolved here once so the per-target loops below
+        # are pure integer adds.
+        active_days = [
+            (date_to_offset[d],) + day_work_windows.get(d, (0, 24 * 60)) for d in dates if drivers_by_date.get(d)
+        ]
+        for t in targets:
+            dtw = t.get("datetime_window")
+            if dtw and dtw.get("date") in date_to_offset:
+                try:
+                    start_h, start_m = map(int, dtw["start"].split(":"))
+                    end_h, end_m = map(int, dtw["end"].split(":"))
+                    start = date_to_offset[dtw["date"]] + start_h * 60 + start_m
+                    end = date_to_offset[dtw["date"]] + end_h * 60 + end_m
+                    stay = t.get("stay_minutes", 0)
+                    end = max(start + 1, end - stay)
+                    _append_clone(t, start, end)
+                    continue
+                except Exception:
+                    pass
+            if t.get("time_window"):
+                start, end = t["time_window"]
                 stay = t.get("stay_minutes", 0)
                 end = max(start + 1, end - stay)
-                expanded_targets.append({**t, "node_id": t["id"], "base_id": t["id"], "tw_abs": (start, end)})
-                continue
-            except Exception:
-                pass
-        if t.get("time_window"):
-            start, end = t["time_window"]
-            stay = t.get("stay_minutes", 0)
-            end = max(start + 1, end - stay)
-            for date_str, offset in date_to_offset.items():
-                expanded_targets.append(
-                    {**t, "node_id": f"{t['id']}@{date_str}", "base_id": t["id"], "tw_abs": (offset + start, offset + end)}
-                )
+                for offset, _day_start, _day_end in active_days:
+                    _append_clone(t, offset + start, offset + end)
+            else:
+                stay = t.get("stay_minutes", 0)
+                for offset, day_start, day_end in active_days:
+                    end = max(day_start + 1, day_end - stay)
+                    _append_clone(t, offset + day_start, offset + end)
+
+        num_expanded = len(exp_base_ids)
+
+        # Clones repeat the same physical coordinates once per day, so both
+        # paths work from the (N+1)^2 base matrix and expand it to
+        # (N*D+1)^2 with a pure integer gather instead of redoing the trig
+        # on every duplicated pair.
+        base_index = {t["id"]: idx for idx, t in enumerate(targets)}
+        node_map = np.array([0] + [base_index[b] + 1 for b in exp_base_ids])
+        if travel_time_matrix is not None:
+            # Gather rows/cols of the precomputed base matrix for each expanded clone.
+            gathered = np.ceil(np.asarray(travel_time_matrix, dtype=np.float64))[np.ix_(node_map, node_map)]
+            time_matrix = np.ascontiguousarray(gathered, dtype=np.int32)
         else:
-            stay = t.get("stay_minutes", 0)
-            for date_str, offset in date_to_offset.items():
-                day_start, day_end = day_work_windows.get(date_str, (0, 24 * 60))
-                end = max(day_start + 1, day_end - stay)
-                expanded_targets.append(
-                    {
-                        **t,
-                        "node_id": f"{t['id']}@{date_str}",
-                        "base_id": t["id"],
-                        "tw_abs": (offset + day_start, offset + end),
-                    }
-                )
-
-    time_matrix = _build_time_matrix(branch_pt, expanded_targets, speed_kmph)
-
-    data = {
-        "time_matrix": time_matrix,
-        "time_windows": [t["tw_abs"] for t in expanded_targets],
-        "targets": expanded_targets,
-        "vehicles": vehicles,
-        "service_times": [t["stay_minutes"] for t in expanded_targets],
-    }
-
-    manager = pywrapcp.RoutingIndexManager(len(time_matrix), len(vehicles), [0] * len(vehicles), [0] * len(vehicles))
-    routing = pywrapcp.RoutingModel(manager)
-
-    def time_callback(from_index: int, to_index: int) -> int:
-        f = manager.IndexToNode(from_index)
-        t = manager.IndexToNode(to_index)
-        travel = data["time_matrix"][f][t]
-        service = 0
-        if f != 0:
-            service = data["service_times"][f - 1]
-        return travel + service
-
-    def travel_only_callback(from_index: int, to_index: int) -> int:
-        f = manager.IndexToNode(from_index)
-        t = manager.IndexToNode(to_index)
-        return data["time_matrix"][f][t]
-
-    transit_callback_index = routing.RegisterTransitCallback(time_callback)
-    travel_cost_index = routing.RegisterTransitCallback(travel_only_callback)
-    routing.SetArcCostEvaluatorOfAllVehicles(travel_cost_index)
-
-    routing.AddDimension(
-        transit_callback_index,
-        24 * 60,  # waiting slack
-        horizon,
-        False,
-        "Time",
-    )
-    time_dimension = routing.GetDimensionOrDie("Time")
-
-    # Capacity dimension to limit stops per vehicle (encourage multi-driver usage) for multi-vehicle cases.
-    demands = [0] + [1] * len(expanded_targets)
-    def demand_callback(from_index: int) -> int:
-        node = manager.IndexToNode(from_index)
-        return demands[node]
-    demand_idx = routing.RegisterUnaryTransitCallback(demand_callback)
-    # For single-vehicle case, allow all; for multi-vehicle, cap modestly to encourage spreading.
-    if len(vehicles) == 1:
-        capacities = [len(expanded_targets) + 1]
-    else:
-        dynamic_capacity = max_stops_per_vehicle
-        if len(expanded_targets) > 50 and len(dates) > 1:
-            dynamic_capacity = min(max(dynamic_capacity, 20), 25)
-        capacities = [dynamic_capacity] * len(vehicles)
-    routing.AddDimensionWithVehicleCapacity(demand_idx, 0, capacities, True, "Capacity")
-
-    # Node time windows
-    for node_index, target in enumerate(expanded_targets, start=1):
-        idx = manager.NodeToIndex(node_index)
-        tw = data["time_windows"][node_index - 1]
-        time_dimension.CumulVar(idx).SetRange(tw[0], tw[1])
-        routing.AddToAssignment(time_dimension.SlackVar(idx))
-        routing.AddToAssignment(time_dimension.CumulVar(idx))
-
-    # Vehicle start/end windows
-    for v, vehicle in enumerate(vehicles):
-        start = routing.Start(v)
-        end = routing.End(v)
-        time_dimension.CumulVar(start).SetRange(vehicle["start"], vehicle["start"])
-        time_dimension.CumulVar(end).SetRange(vehicle["start"], vehicle["end"])
-        # No fixed cost penalty so vehicles can be used when beneficial.
-        routing.SetFixedCostOfVehicle(0, v)
-
-    # Visit count priority: very large penalties, and only one clone (per day) may be visited for the same base_id
-    # Penalties must stay within safe int range for OR-Tools; keep large to force assignment.
-    penalty_required = 1_000_000_000
-    penalty_optional = 500_000_000
-    base_to_nodes: Dict[str, List[int]] = {}
-    for node_index, target in enumerate(expanded_targets, start=1):
-        base_to_nodes.setdefault(target["base_id"], []).append(manager.NodeToIndex(node_index))
-    for node_indices in base_to_nodes.values():
-        # all clones share same base_id and required flag
-        any_target = expanded_targets[manager.IndexToNode(node_indices[0]) - 1]
-        penalty = penalty_required if any_target.get("required", True) else penalty_optional
-        routing.AddDisjunction(node_indices, penalty)
-
-    time_dimension.SetSpanCostCoefficientForAllVehicles(0)
+            small = _build_time_matrix(branch_pt, targets, speed_kmph, use_fast_distance=use_fast_distance)
+            time_matrix = np.ascontiguousarray(small[np.ix_(node_map, node_map)], dtype=np.int32)
 
-    search_parameters = pywrapcp.DefaultRoutingSearchParameters()
-    search_parameters.first_solution_strategy = routing_enums_pb2.FirstSolutionStrategy.PARALLEL_CHEAPEST_INSERTION
-    search_parameters.local_search_metaheuristic = routing_enums_pb2.LocalSearchMetaheuristic.TABU_SEARCH
-    search_parameters.time_limit.FromSeconds(max_solve_seconds)
-    search_parameters.use_full_propagation = True
-    search_parameters.log_search = False
+        data = {
+            "time_matrix": time_matrix,
+            "time_windows": exp_tw,
+            "service_times": exp_stays,
+        }
 
-    solution = routing.SolveWithParameters(search_parameters)
-    time_dimension = routing.GetDimensionOrDie("Time")
-    schedules: Dict[str, Dict[str, Any]] = {d: {"status": "success", "date": d, "routes": [], "unassigned": []} for d in dates}
-    global_unassigned: List[str] = []
+        manager = _routing_index_manager(len(time_matrix), len(vehicles))
+        routing = pywrapcp.RoutingModel(manager, _routing_model_parameters(len(time_matrix)))
 
-    if solution:
-        dropped_nodes = []
-        for node in range(routing.Size()):
-            if routing.IsStart(node) or routing.IsEnd(node):
-                continue
-            if solution.Value(routing.NextVar(node)) == node:
-                dropped_nodes.append(node)
-        for dn in dropped_nodes:
-            idx = manager.IndexToNode(dn)
-            target_id = expanded_targets[idx - 1]["base_id"]
-            global_unassigned.append(target_id)
-
-        for vehicle_id, vehicle in enumerate(vehicles):
-            index = routing.Start(vehicle_id)
-            stops = []
-            total_travel = 0
-            total_stay = 0
-            prev_depart = vehicle["start"]
-            while not routing.IsEnd(index):
-                node_index = manager.IndexToNode(index)
-                if node_index != 0:
-                    target = expanded_targets[node_index - 1]
-                    time_var = time_dimension.CumulVar(index)
-                    arrival = solution.Value(time_var)
-                    travel = max(0, arrival - prev_depart)
-                    depart = arrival + target["stay_minutes"]
-                    stops.append(
-                        {
-                            "target_id": target["id"],
-                            "arrival_min": float(arrival),
-                            "depart_min": float(depart),
-                            "travel_minutes": float(travel),
-                            "stay_minutes": float(target["stay_minutes"]),
-                        }
-                    )
-                    total_travel += travel
-                    total_stay += target["stay_minutes"]
-                    prev_depart = depart
-                index = solution.Value(routing.NextVar(index))
-
-            end_index = routing.End(vehicle_id)
-            end_arrival = solution.Value(time_dimension.CumulVar(end_index))
-            return_travel = max(0, end_arrival - prev_depart)
-            total_travel += return_travel
-            end_time = float(end_arrival)
-
-            schedules[vehicle["date"]]["routes"].append(
-                {
-                    "driver_id": vehicle["id"],
-                    "stops": stops,
-                    "travel_minutes": float(total_travel),
-                    "stay_minutes": float(total_stay),
-                    "end_time": end_time,
-                    "overtime_minutes": max(0.0, end_time - vehicle["end"]),
-                    "return_travel_minutes": float(return_travel),
-                }
-            )
-    else:
-        # No feasible solution found
-        return {"status": "no_solution", "message": "No feasible solution found within time limit", "schedules": [], "unassigned": list(base_targets.keys())}
+        transit_callback_index, travel_cost_index = _register_transit_matrices(
+            routing, time_matrix, data["service_times"]
+        )
+        routing.SetArcCostEvaluatorOfAllVehicles(travel_cost_index)
+
+        routing.AddDimension(
+            transit_callback_index,
+            24 * 60,  # waiting slack
+            horizon,
+            False,
+            "Time",
+        )
+        time_dimension = routing.GetDimensionOrDie("Time")
+
+        # Capacity dimension to limit stops per vehicle (encourage multi-driver usage) for multi-vehicle cases.
+        demands = [0] + [1] * num_expanded
+        def demand_callback(from_index: int) -> int:
+            node = manager.IndexToNode(from_index)
+            return demands[node]
+        demand_idx = routing.RegisterUnaryTransitCallback(demand_callback)
+        # For single-vehicle case, allow all; for multi-vehicle, cap modestly to encourage spreading.
+        if len(vehicles) == 1:
+            capacities = [num_expanded + 1]
+        else:
+            dynamic_capacity = max_stops_per_vehicle
+            if num_expanded > 50 and len(dates) > 1:
+                dynamic_capacity = min(max(dynamic_capacity, 20), 25)
+            capacities = [dynamic_capacity] * len(vehicles)
+        routing.AddDimensionWithVehicleCapacity(demand_idx, 0, capacities, True, "Capacity")
+
+        # Node solver indices, resolved once: the time-window and disjunction
+        # loops below reuse them instead of repeating the SWIG call per node.
+        node_indices = [manager.NodeToIndex(n) for n in range(1, num_expanded + 1)]
+
+        # Node time windows
+        cumul_var_of = time_dimension.CumulVar
+        for node_index in range(1, num_expanded + 1):
+            tw = data["time_windows"][node_index - 1]
+            cumul_var_of(node_indices[node_index - 1]).SetRange(tw[0], tw[1])
+
+        # Vehicle start/end windows
+        for v, vehicle in enumerate(vehicles):
+            start = routing.Start(v)
+            end = routing.End(v)
+            time_dimension.CumulVar(start).SetRange(vehicle["start"], vehicle["start"])
+            time_dimension.CumulVar(end).SetRange(vehicle["start"], vehicle["end"])
+            # No fixed cost penalty so vehicles can be used when beneficial.
+            routing.SetFixedCostOfVehicle(0, v)
+
+        # Visit count priority: very large penalties, and only one clone (per day) may be visited for the same base_id
+        # Penalties must stay within safe int range for OR-Tools; keep large to force assignment.
+        penalty_required = 1_000_000_000
+        penalty_optional = 500_000_000
+        required_by_base = {t["id"]: t.get("required", True) for t in targets}
+        # Clones of one base target are appended consecutively during
+        # expansion, so the groups are contiguous runs of exp_base_ids —
+        # scan them directly instead of hashing every clone into a dict.
+        j = 0
+        while j < num_expanded:
+            base_id = exp_base_ids[j]
+            k = j + 1
+            while k < num_expanded and exp_base_ids[k] == base_id:
+                k += 1
+            # all clones share same base_id and required flag
+            penalty = penalty_required if required_by_base[base_id] else penalty_optional
+            routing.AddDisjunction(node_indices[j:k], penalty)
+            j = k
+
+        time_dimension.SetSpanCostCoefficientForAllVehicles(0)
+
+        search_parameters = pywrapcp.DefaultRoutingSearchParameters()
+        search_parameters.first_solution_strategy = routing_enums_pb2.FirstSolutionStrategy.PARALLEL_CHEAPEST_INSERTION
+        search_parameters.local_search_metaheuristic = routing_enums_pb2.LocalSearchMetaheuristic.GENERIC_TABU_SEARCH
+        search_parameters.time_limit.FromSeconds(max_solve_seconds)
+        search_parameters.use_full_propagation = True
+        search_parameters.use_multi_armed_bandit_concatenate_operators = True
+        search_parameters.log_search = False
+
+        solution = routing.SolveWithParameters(search_parameters)
+        time_dimension = routing.GetDimensionOrDie("Time")
+        schedules = {d: {"status": "success", "date": d, "routes": [], "unassigned": []} for d in dates}
+        global_unassigned: List[str] = []
+
+        if solution:
+            # Local bindings for the SWIG-crossing methods hit per node below.
+            value = solution.Value
+            next_var = routing.NextVar
+            cumul_var = time_dimension.CumulVar
+            index_to_node = manager.IndexToNode
+            # No dropped-node sweep here: the fallback below rebuilds the
+            # assigned set from the extracted stops and global_unassigned is
+            # recomputed from it, so the NextVar scan was pure overhead.
+            for vehicle_id, vehicle in enumerate(vehicles):
+                index = routing.Start(vehicle_id)
+                stops = []
+                total_travel = 0
+                total_stay = 0
+                prev_depart = vehicle["start"]
+                while not routing.IsEnd(index):
+                    node_index = index_to_node(index)
+                    if node_index != 0:
+                        stay = exp_stays[node_index - 1]
+                        base_id = exp_base_ids[node_index - 1]
+                        arrival = value(cumul_var(index))
+                        travel = max(0, arrival - prev_depart)
+                        depart = arrival + stay
+                        # Integer minutes throughout; no float boxing needed.
+                        stops.append(
+                            {
+                                "target_id": base_id,
+                                "base_id": base_id,
+                                "arrival_min": arrival,
+                                "depart_min": depart,
+                                "travel_minutes": travel,
+                                "stay_minutes": stay,
+                            }
+                        )
+                        total_travel += travel
+                        total_stay += stay
+                        prev_depart = depart
+                    index = value(next_var(index))
+
+                end_index = routing.End(vehicle_id)
+                end_arrival = value(cumul_var(end_index))
+                return_travel = max(0, end_arrival - prev_depart)
+                total_travel += return_travel
+                schedules[vehicle["date"]]["routes"].append(
+                    {
+                        "driver_id": vehicle["id"],
+                        "stops": stops,
+                        "travel_minutes": total_travel,
+                        "stay_minutes": total_stay,
+                        "end_time": end_arrival,
+                        "overtime_minutes": max(0, end_arrival - vehicle["end"]),
+                        "return_travel_minutes": return_travel,
+                    }
+                )
+        else:
+            # No feasible solution found
+            return {"status": "no_solution", "message": "No feasible solution found within time limit", "schedules": [], "unassigned": list(base_targets.keys())}
 
     # Fallback: if not all targets were assigned, distribute remaining sequentially across days/drivers (within daily hours).
     assigned_ids = set()
     for sched in schedules.values():
         for route in sched["routes"]:
             for stop in route.get("stops", []):
-                assigned_ids.add(stop["target_id"].split("@")[0])
-    remaining = [base_targets[tid] for tid in base_targets if tid not in assigned_ids]
-
-    if remaining:
-        remaining.sort(key=lambda t: t["id"])
+                assigned_ids.add(stop["base_id"])
+    rem_list = sorted((base_targets[tid] for tid in base_targets if tid not in assigned_ids), key=lambda t: t["id"])
+
+    if rem_list:
+        # The packing scan itself (haversine chain per candidate) runs in the
+        # jitted _greedy_pack kernel over flat arrays; Python walks an index
+        # pointer and only translates the packed prefix back into stop dicts.
+        rem_lats = np.asarray([t["lat"] for t in rem_list], dtype=np.float64)
+        rem_lons = np.asarray([t["lon"] for t in rem_list], dtype=np.float64)
+        rem_stays = np.asarray([t.get("stay_minutes", 0) for t in rem_list], dtype=np.float64)
+        pos = 0
         for date in dates:
-            if not remaining:
+            if pos >= len(rem_list):
                 break
             offset = date_to_offset[date]
             drv_list = drivers_by_date.get(date, [])
             for drv in drv_list:
-                if not remaining:
+                if pos >= len(rem_list):
                     break
-                current = offset + drv["start_time"]
-                end_time = offset + drv["end_time"]
+                start = float(offset + drv["start_time"])
+                end_time = float(offset + drv["end_time"])
+                count, arrivals, departs, travels, current = _greedy_pack(
+                    rem_lats[pos:],
+                    rem_lons[pos:],
+                    rem_stays[pos:],
+                    branch_pt,
+                    start,
+                    end_time,
+                    minutes_per_km,
+                    max_stops_per_vehicle,
+                )
                 stops = []
                 travel_acc = 0.0
-                prev_point = branch_pt
-                while remaining and len(stops) < max_stops_per_vehicle:
-                    stay = remaining[0].get("stay_minutes", 0)
-                    # travel from prev_point to this target
-                    dist_km = haversine_km(prev_point, (remaining[0]["lat"], remaining[0]["lon"]))
-                    travel = travel_time_minutes(dist_km, speed_kmph)
-                    if current + travel + stay > end_time:
-                        break
-                    t = remaining.pop(0)
+                for k in range(count):
+                    t = rem_list[pos + k]
                     assigned_ids.add(t["id"])
-                    arrival = current + travel
-                    depart = arrival + stay
                     stops.append(
                         {
                             "target_id": t["id"],
-                            "arrival_min": float(arrival),
-                            "depart_min": float(depart),
-                            "travel_minutes": float(travel),
-                            "stay_minutes": float(stay),
+                            "base_id": t["id"],
+                            "arrival_min": float(arrivals[k]),
+                            "depart_min": float(departs[k]),
+                            "travel_minutes": float(travels[k]),
+                            "stay_minutes": float(rem_stays[pos + k]),
                         }
                     )
-                    current = depart
-                    travel_acc += travel
-                    prev_point = (t["lat"], t["lon"])
+                    travel_acc += float(travels[k])
                 # return to branch
                 return_travel = 0.0
                 if stops:
-                    dist_back = haversine_km(prev_point, branch_pt)
-                    return_travel = travel_time_minutes(dist_back, speed_kmph)
+                    last = rem_list[pos + count - 1]
+                    return_travel = haversine_km((last["lat"], last["lon"]), branch_pt) * minutes_per_km
                     travel_acc += return_travel
                     current += return_travel
+                pos += count
                 schedules[date]["routes"].append(
                     {
                         "driver_id": drv["id"],
@@ -545,6 +1712,7 @@ def build_global_plan(
     global_unassigned = sorted(set(base_targets.keys()) - assigned_ids)
 
     # Post-fix: ensure earliest used day includes all available drivers if later days are used
+    drivers_by_id_by_date = {d: {drv["id"]: drv for drv in drvs} for d, drvs in drivers_by_date.items()}
     used_days = [d for d in dates if any(r.get("stops") for r in schedules[d]["routes"])]
     if used_days:
         first_day = used_days[0]
@@ -552,29 +1720,36 @@ def build_global_plan(
         present_first = {r["driver_id"] for r in schedules[first_day]["routes"] if r.get("stops")}
         missing = list(available_first - present_first)
         if missing:
-            # donors from later days first, then from any route with >1 stop
-            donor_slots = []
-            for d in used_days[1:]:
-                for ri, r in enumerate(schedules[d]["routes"]):
-                    if r.get("stops"):
-                        donor_slots.append((d, ri, -1))
-            for d in used_days:
-                for ri, r in enumerate(schedules[d]["routes"]):
-                    if len(r.get("stops", [])) > 1:
-                        donor_slots.append((d, ri, -1))
+            # Donor heap: later-day routes first (tier 0), then any route that
+            # can spare a stop (tier 1); within a tier the longest route
+            # donates first. Entries are revalidated lazily against the live
+            # stop count on pop, so updates are O(log V) instead of rescans.
+            donor_heap: List[Tuple[int, int, str, int]] = []
+            for tier, tier_days, min_stops in ((0, used_days[1:], 1), (1, used_days, 2)):
+                for d in tier_days:
+                    for ri, r in enumerate(schedules[d]["routes"]):
+                        n_stops = len(r.get("stops", []))
+                        if n_stops >= min_stops:
+                            heapq.heappush(donor_heap, (tier, -n_stops, d, ri))
 
             donor_idx = 0
             for drv_id in missing:
-                if donor_idx >= len(donor_slots):
+                route = None
+                while donor_heap:
+                    tier, neg_stops, d, ri = heapq.heappop(donor_heap)
+                    candidate = schedules[d]["routes"][ri]
+                    if len(candidate.get("stops", [])) == -neg_stops:
+                        route = candidate
+                        break
+                if route is None:
                     break
-                d, ri, si = donor_slots[donor_idx]
                 donor_idx += 1
-                route = schedules[d]["routes"][ri]
-                if not route.get("stops"):
-                    continue
-                stop = route["stops"].pop(si)
+                stop = route["stops"].pop()
+                remaining = len(route["stops"])
+                if remaining >= (1 if tier == 0 else 2):
+                    heapq.heappush(donor_heap, (tier, -remaining, d, ri))
                 route["stay_minutes"] = max(0.0, route.get("stay_minutes", 0.0) - stop.get("stay_minutes", 0.0))
-                drv_info = next((drv for drv in drivers_by_date.get(first_day, []) if drv["id"] == drv_id), None)
+                drv_info = drivers_by_id_by_date.get(first_day, {}).get(drv_id)
                 if not drv_info:
                     continue
                 offset = date_to_offset[first_day]
@@ -586,6 +1761,7 @@ def build_global_plan(
                         "stops": [
                             {
                                 "target_id": stop["target_id"],
+                                "base_id": stop.get("base_id", stop["target_id"]),
                                 "arrival_min": float(arrival),
                                 "depart_min": float(depart),
                                 "travel_minutes": 0.0,
@@ -614,7 +1790,7 @@ def build_global_plan(
                     route["stay_minutes"] = max(0.0, route.get("stay_minutes", 0.0) - stop.get("stay_minutes", 0.0))
                     missing_rest = missing[donor_idx:]
                     for drv_id in missing_rest:
-                        drv_info = next((drv for drv in drivers_by_date.get(first_day, []) if drv["id"] == drv_id), None)
+                        drv_info = drivers_by_id_by_date.get(first_day, {}).get(drv_id)
                         if not drv_info:
                             continue
                         offset = date_to_offset[first_day]
@@ -626,6 +1802,7 @@ def build_global_plan(
                                 "stops": [
                                     {
                                         "target_id": stop["target_id"],
+                                        "base_id": stop.get("base_id", stop["target_id"]),
                                         "arrival_min": float(arrival),
                                         "depart_min": float(depart),
                                         "travel_minutes": 0.0,
@@ -641,139 +1818,57 @@ def build_global_plan(
                         )
                         break
 
-    # Local 2-opt heuristic for routes without any time windows to reduce travel distance (single day offsets applied)
-    def optimize_route_order(route: Dict[str, Any], driver_start: float, driver_end: float) -> Dict[str, Any]:
-        stops = route.get("stops", [])
-        if len(stops) < 3:
-            return route
-        if any(
-            base_targets[s["target_id"]].get("time_window") or base_targets[s["target_id"]].get("datetime_window")
-            for s in stops
-        ):
-            return route
-
-        coords = [branch_pt] + [(base_targets[s["target_id"]]["lat"], base_targets[s["target_id"]]["lon"]) for s in stops] + [branch_pt]
-        dist = [[travel_time_minutes(haversine_km(a, b), speed_kmph) for b in coords] for a in coords]
-
-        m = len(stops)
-        order = list(range(1, m + 1))
-        if m <= 20:
-            # exact TSP with DP (depot at index 0, return to depot)
-            ALL = 1 << m
-            dp = [[math.inf] * m for _ in range(ALL)]
-            parent = [[-1] * m for _ in range(ALL)]
-            for j in range(m):
-                dp[1 << j][j] = dist[0][j + 1]
-            for mask in range(ALL):
-                for j in range(m):
-                    if not (mask & (1 << j)):
-                        continue
-                    cost = dp[mask][j]
-                    if cost == math.inf:
-                        continue
-                    for k in range(m):
-                        if mask & (1 << k):
-                            continue
-                        nmask = mask | (1 << k)
-                        new_cost = cost + dist[j + 1][k + 1]
-                        if new_cost < dp[nmask][k]:
-                            dp[nmask][k] = new_cost
-                            parent[nmask][k] = j
-            best_cost = math.inf
-            last = -1
-            full = ALL - 1
-            for j in range(m):
-                c = dp[full][j] + dist[j + 1][0]
-                if c < best_cost:
-                    best_cost = c
-                    last = j
-            # reconstruct
-            mask = full
-            seq = []
-            while last != -1:
-                seq.append(last)
-                prev = parent[mask][last]
-                mask ^= 1 << last
-                last = prev if mask else -1
-            seq.reverse()
-            order = [s + 1 for s in seq]  # convert to coords index (1-based for stops)
-        else:
-            # 2-opt heuristic with multiple passes
-            for _ in range(3):
-                improved = True
-                while improved:
-                    improved = False
-                    for i in range(len(order) - 1):
-                        for j in range(i + 2, len(order)):
-                            if j == len(order) - 1 and i == 0:
-                                continue
-                            a, b = order[i - 1] if i > 0 else 0, order[i]
-                            c, d = order[j], order[j + 1] if j + 1 < len(order) else len(coords) - 1
-                            before = dist[a][b] + dist[c][d]
-                            after = dist[a][c] + dist[b][d]
-                            if after + 1e-6 < before:
-                                order[i:j + 1] = reversed(order[i:j + 1])
-                                improved = True
-                                break
-                        if improved:
-                            break
-
-        # Rebuild route with new order
-        current = driver_start
-        new_stops = []
-        travel_total = 0.0
-        stay_total = 0.0
-        prev_coord = branch_pt
-        for idx in order:
-            t_id = stops[idx - 1]["target_id"]
-            t = base_targets[t_id]
-            travel = travel_time_minutes(haversine_km(prev_coord, (t["lat"], t["lon"])), speed_kmph)
-            arrival = current + travel
-            depart = arrival + t.get("stay_minutes", 0)
-            new_stops.append(
-                {
-                    "target_id": t_id,
-                    "arrival_min": float(arrival),
-                    "depart_min": float(depart),
-                    "travel_minutes": float(travel),
-                    "stay_minutes": float(t.get("stay_minutes", 0)),
-                }
-            )
-            travel_total += travel
-            stay_total += t.get("stay_minutes", 0)
-            current = depart
-            prev_coord = (t["lat"], t["lon"])
-
-        return_travel = travel_time_minutes(haversine_km(prev_coord, branch_pt), speed_kmph)
-        travel_total += return_travel
-        current += return_travel
-        return {
-            **route,
-            "stops": new_stops,
-            "travel_minutes": float(travel_total - return_travel),
-            "stay_minutes": float(stay_total),
-            "return_travel_minutes": float(return_travel),
-            "end_time": float(current),
-            "overtime_minutes": max(0.0, current - driver_end),
-        }
-
     driver_time_map = {
         d: {drv["id"]: (date_to_offset[d] + drv["start_time"], date_to_offset[d] + drv["end_time"]) for drv in drv_list}
         for d, drv_list in drivers_by_date.items()
     }
+    # Flatten the per-target fields the optimizer touches into single-lookup
+    # maps; the per-stop rebuild then does one dict hit per field instead of
+    # several string-keyed gets on the full target dicts.
+    branch_key = (round(branch_pt[0], 6), round(branch_pt[1], 6))
+    coord_of = {tid: (round(t["lat"], 6), round(t["lon"], 6)) for tid, t in base_targets.items()}
+    stay_of = {tid: t.get("stay_minutes", 0) for tid, t in base_targets.items()}
+    windowed = {tid for tid, t in base_targets.items() if t.get("time_window") or t.get("datetime_window")}
+
+    # Optimize each route independently; the TSP-heavy work is embarrassingly
+    # parallel, and the jitted kernels release the GIL, so map across threads.
+    jobs = []
     for sched in schedules.values():
         for idx, r in enumerate(sched["routes"]):
             times = driver_time_map.get(sched["date"], {}).get(r["driver_id"])
             if not times:
                 continue
-            optimized = optimize_route_order(r, times[0], times[1])
-            sched["routes"][idx] = optimized
+            jobs.append((sched, idx, r, times[0], times[1]))
+    if len(jobs) > 1:
+        with ThreadPoolExecutor() as executor:
+            optimized = list(
+                executor.map(
+                    lambda j: _optimize_route_order(j[2], j[3], j[4], branch_key, coord_of, stay_of, windowed, minutes_per_km),
+                    jobs,
+                )
+            )
+    else:
+        optimized = [
+            _optimize_route_order(j[2], j[3], j[4], branch_key, coord_of, stay_of, windowed, minutes_per_km)
+            for j in jobs
+        ]
+    for (sched, idx, _r, _s, _e), opt in zip(jobs, optimized):
+        sched["routes"][idx] = opt
+
+    # Plan-wide travel total (return legs included), computed once here while
+    # the routes are cache-hot instead of re-summed by every consumer.
+    total_travel_minutes = sum(
+        r.get("travel_minutes", 0) + r.get("return_travel_minutes", 0)
+        for sched in schedules.values()
+        for r in sched["routes"]
+    )
 
     return {
         "status": "success",
         "dates": dates,
         "schedules": list(schedules.values()),
         "unassigned": global_unassigned,
+        "total_travel_minutes": total_travel_minutes,
         "warnings": missing_driver_dates,
     }
 
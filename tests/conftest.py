@@ -0,0 +1,8 @@
+def pytest_collection_modifyitems(items):
+    """
+    Schedule slow-marked tests (multi-second OR-Tools solves) first. Under
+    pytest-xdist work stealing (-n auto --dist worksteal) the long solves then
+    overlap the short tests instead of trailing the run; serial runs are
+    unaffected beyond the reordering.
+    """
+    items.sort(key=lambda item: 0 if item.get_closest_marker("slow") else 1)
@@ -2,7 +2,7 @@ import math
 
 import pytest
 
-from vrp.geo import haversine_km, travel_time_minutes
+from vrp.geo import haversine_km, haversine_km_matrix, haversine_km_pairs, travel_time_minutes
 
 
 def test_haversine_distance_matches_known_value():
@@ -11,6 +11,23 @@ def test_haversine_distance_matches_known_value():
     assert math.isclose(dist, 111.195, rel_tol=1e-3)
 
 
+def test_haversine_matrix_matches_scalar():
+    lats = [0.0, 0.0, 10.0]
+    lons = [0.0, 1.0, 123.0]
+    matrix = haversine_km_matrix(lats, lons)
+    assert matrix.shape == (3, 3)
+    for i in range(3):
+        for j in range(3):
+            expected = haversine_km((lats[i], lons[i]), (lats[j], lons[j]))
+            assert math.isclose(float(matrix[i][j]), expected, rel_tol=1e-5, abs_tol=1e-5)
+
+
+def test_haversine_pairs_matches_scalar():
+    dists = haversine_km_pairs([0.0, 10.0], [0.0, 123.0], [0.0, 10.5], [1.0, 123.5])
+    assert math.isclose(float(dists[0]), haversine_km((0.0, 0.0), (0.0, 1.0)), rel_tol=1e-9)
+    assert math.isclose(float(dists[1]), haversine_km((10.0, 123.0), (10.5, 123.5)), rel_tol=1e-9)
+
+
 def test_travel_time_minutes_scales_with_speed():
     dist_km = 40.0
     speed_kmph = 40.0
@@ -0,0 +1,121 @@
+"""
+プロセス終了（exit cleanliness）の回帰テスト。
+
+numba の parallel カーネル実行後に fork でワーカーを作ると、子プロセスが
+初期化済みスレッド層を継承してインタプリタ終了時にデッドロックする。
+ソルバーは spawn コンテキストを使うことで回避しており、ここでは
+サブプロセスで実シナリオを走らせて「結果が返ったあとプロセスが
+正常終了する」ことを確認する（ハングはテストプロセス内では検出できない）。
+"""
+
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+_SRC = os.path.join(os.path.dirname(__file__), os.pardir, "src")
+
+
+def _run_in_fresh_interpreter(script, timeout=300):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.path.abspath(_SRC)
+    return subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(script)],
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+        env=env,
+    )
+
+
+@pytest.mark.slow
+def test_monolithic_then_separable_global_plan_process_exits():
+    """
+    同一プロセスで「一体型（自由ターゲット）→ 全件日付固定（分離型）」の
+    順に build_global_plan を呼ぶと、一体型が parallel カーネルを実行した後に
+    分離型が ProcessPoolExecutor を起動する。fork だとここで終了時ハング。
+    """
+    result = _run_in_fresh_interpreter(
+        """
+        from vrp.solver import build_global_plan
+
+        dates = ["2025-11-24", "2025-11-25"]
+        branch = {"lat": 10.0, "lon": 123.0}
+        drivers_by_date = {
+            d: [{"id": "A", "start_time": 8 * 60, "end_time": 19 * 60}] for d in dates
+        }
+
+        def targets(pinned):
+            out = []
+            for i in range(6):
+                dtw = None
+                if pinned:
+                    dtw = {"date": dates[i % 2], "start": "08:00", "end": "19:00"}
+                out.append({
+                    "id": f"T{i+1:03d}",
+                    "lat": 10.0 + 0.05 * (i % 3),
+                    "lon": 123.0 + 0.05 * (i // 3),
+                    "stay_minutes": 10,
+                    "required": True,
+                    "time_window": None,
+                    "datetime_window": dtw,
+                })
+            return out
+
+        for pinned in (False, True):
+            plan = build_global_plan(
+                dates=dates,
+                branch=branch,
+                drivers_by_date=drivers_by_date,
+                targets=targets(pinned),
+                speed_kmph=40.0,
+                max_solve_seconds=1,
+            )
+            assert plan["status"] == "success", plan["status"]
+        print("OK")
+        """
+    )
+    assert result.returncode == 0, result.stderr
+    assert "OK" in result.stdout
+
+
+@pytest.mark.slow
+def test_multistart_daily_plan_process_exits():
+    """
+    build_daily_plan_multistart は親プロセスで parallel カーネルを使って
+    時間行列を構築してからワーカーを起動するため、fork だと毎回終了時に
+    ハングしていた。spawn 化後のスモーク: 解が返り、プロセスが正常終了する。
+    """
+    result = _run_in_fresh_interpreter(
+        """
+        from vrp.solver import build_daily_plan_multistart
+
+        targets = [
+            {
+                "id": f"T{i+1:03d}",
+                "lat": 10.0 + 0.05 * (i % 4),
+                "lon": 123.0 + 0.05 * (i // 4),
+                "stay_minutes": 10,
+                "required": True,
+                "time_window": None,
+                "datetime_window": None,
+            }
+            for i in range(8)
+        ]
+        config = {
+            "date": "2025-11-24",
+            "branch": {"lat": 10.0, "lon": 123.0},
+            "drivers": [{"id": "A", "start_time": 8 * 60, "end_time": 19 * 60}],
+            "speed_kmph": 40.0,
+            "max_solve_seconds": 1,
+        }
+        plan = build_daily_plan_multistart(config, targets, n_workers=2)
+        assert plan["status"] == "success", plan["status"]
+        assert plan["routes"][0]["stops"]
+        print("OK")
+        """
+    )
+    assert result.returncode == 0, result.stderr
+    assert "OK" in result.stdout
@@ -1,17 +1,152 @@
+import copy
+import itertools
+import json
+import random
 import time
-import math
+
+import numpy as np
+import pytest
 
 from vrp.solver import build_global_plan
-from vrp.geo import haversine_km, travel_time_minutes
+from vrp.geo import haversine_km_pairs
+
+# 全テスト共通の支店座標と走行速度（fixture のハッシュキー安定化にも寄与）
+BRANCH = {"lat": 10.0, "lon": 123.0}
+SPEED_KMPH = 40.0
 
 
 def make_driver(id="A"):
     return {"id": id, "start_time": 8 * 60, "end_time": 19 * 60}
 
 
+def three_drivers_by_date(dates):
+    # One roster shared by every date: the solver only reads driver records,
+    # so there is no need to allocate a fresh list of dicts per day.
+    return dict.fromkeys(dates, (make_driver("A"), make_driver("B"), make_driver("C")))
+
+
+def _routes(plan):
+    return itertools.chain.from_iterable(sched["routes"] for sched in plan["schedules"])
+
+
+def total_travel(plan):
+    """Total travel minutes (return legs included) across all schedules."""
+    return plan["total_travel_minutes"]
+
+
+def total_travel_resummed(plan):
+    """Recompute the travel total from the routes (cross-check only)."""
+    return sum(r.get("travel_minutes", 0) + r.get("return_travel_minutes", 0) for r in _routes(plan))
+
+
+def visited_ids(plan):
+    """Visited target ids in route order, for duplicate-assignment checks."""
+    return [s["target_id"] for r in _routes(plan) for s in r.get("stops", [])]
+
+
+def route_time_vec(seq, branch, speed_kmph, per_leg_ceil=False):
+    """
+    branch -> seq order -> branch travel minutes, computed with one
+    vectorized haversine pass instead of a per-leg Python loop.
+    """
+    if not seq:
+        return 0.0
+    lats = np.array([branch["lat"]] + [t["lat"] for t in seq] + [branch["lat"]])
+    lons = np.array([branch["lon"]] + [t["lon"] for t in seq] + [branch["lon"]])
+    minutes = haversine_km_pairs(lats[:-1], lons[:-1], lats[1:], lons[1:]) * (60.0 / speed_kmph)
+    if per_leg_ceil:
+        minutes = np.ceil(minutes)
+    return float(minutes.sum())
+
+
+@pytest.fixture(scope="module")
+def solve_cached():
+    """
+    build_global_plan memoized on its inputs: the 100-target tests all
+    re-solve the identical single-driver unconstrained baseline, which is
+    pure repeated solver time. Results are deep-copied on return so tests
+    can't contaminate the cache.
+    """
+    cache = {}
+
+    def solve(**kwargs):
+        key = json.dumps(kwargs, sort_keys=True, default=str)
+        if key not in cache:
+            cache[key] = build_global_plan(**kwargs)
+        return copy.deepcopy(cache[key])
+
+    return solve
+
+
+@pytest.fixture(scope="module")
+def grid_targets_30():
+    """5x6 grid at 0.15-degree spacing around the test branch (30 targets)."""
+    targets = []
+    tid = 1
+    for i in range(5):
+        for j in range(6):
+            targets.append(
+                {
+                    "id": f"T{tid:03d}",
+                    "lat": 10.0 + 0.15 * (i - 2),
+                    "lon": 123.0 + 0.15 * (j - 3),
+                    "stay_minutes": 5,
+                    "required": True,
+                    "time_window": None,
+                    "datetime_window": None,
+                }
+            )
+            tid += 1
+    return targets
+
+
+@pytest.fixture(scope="module")
+def grid_targets_36():
+    """6x6 grid at 0.08-degree spacing around the test branch (36 targets)."""
+    targets = []
+    tid = 1
+    for i in range(6):
+        for j in range(6):
+            targets.append(
+                {
+                    "id": f"T{tid:03d}",
+                    "lat": 10.0 + 0.8 * (i - 3) / 10.0,
+                    "lon": 123.0 + 0.8 * (j - 3) / 10.0,
+                    "stay_minutes": 5,
+                    "required": True,
+                    "time_window": None,
+                    "datetime_window": None,
+                }
+            )
+            tid += 1
+    return targets
+
+
+@pytest.fixture(scope="module")
+def grid_targets_100():
+    """10x10 grid at 0.08-degree spacing around the test branch (100 targets)."""
+    targets = []
+    tid = 1
+    for i in range(10):
+        for j in range(10):
+            targets.append(
+                {
+                    "id": f"T{tid:03d}",
+                    "lat": 10.0 + 0.8 * (i - 5) / 10.0,
+                    "lon": 123.0 + 0.8 * (j - 5) / 10.0,
+                    "stay_minutes": 5,
+                    "required": True,
+                    "time_window": None,
+                    "datetime_window": None,
+                }
+            )
+            tid += 1
+    return targets
+
+
 def test_time_limit_is_respected_small_case():
     dates = ["2025-11-23"]
-    branch = {"lat": 10.0, "lon": 123.0}
+    branch = BRANCH
     targets = [
         {"id": "T1", "lat": 10.05, "lon": 123.05, "stay_minutes": 10, "required": True, "time_window": None, "datetime_window": None}
     ]
@@ -23,7 +158,7 @@ def test_time_limit_is_respected_small_case():
         branch=branch,
         drivers_by_date=drivers_by_date,
         targets=targets,
-        speed_kmph=40.0,
+        speed_kmph=SPEED_KMPH,
         max_solve_seconds=1,
     )
     elapsed = time.perf_counter() - started
@@ -35,7 +170,7 @@ def test_time_limit_is_respected_small_case():
 
 def test_travel_positive_for_feasible_solution():
     dates = ["2025-11-23"]
-    branch = {"lat": 10.0, "lon": 123.0}
+    branch = BRANCH
     targets = [
         {"id": "T1", "lat": 10.5, "lon": 123.5, "stay_minutes": 10, "required": True, "time_window": None, "datetime_window": None},
         {"id": "T2", "lat": 10.6, "lon": 123.6, "stay_minutes": 10, "required": True, "time_window": None, "datetime_window": None},
@@ -47,7 +182,7 @@ def test_travel_positive_for_feasible_solution():
         branch=branch,
         drivers_by_date=drivers_by_date,
         targets=targets,
-        speed_kmph=40.0,
+        speed_kmph=SPEED_KMPH,
         max_solve_seconds=1,
     )
     assert plan["status"] == "success"
@@ -65,7 +200,7 @@ def test_travel_positive_for_feasible_solution():
 def test_no_solution_returns_no_solution_status():
     # Force an impossible case by giving no drivers
     dates = ["2025-11-23"]
-    branch = {"lat": 10.0, "lon": 123.0}
+    branch = BRANCH
     targets = [
         {"id": "T1", "lat": 10.1, "lon": 123.1, "stay_minutes": 10, "required": True, "time_window": None, "datetime_window": None}
     ]
@@ -76,7 +211,7 @@ def test_no_solution_returns_no_solution_status():
         branch=branch,
         drivers_by_date=drivers_by_date,
         targets=targets,
-        speed_kmph=40.0,
+        speed_kmph=SPEED_KMPH,
         max_solve_seconds=1,
     )
     assert plan["status"] == "error" or plan["status"] == "no_solution"
@@ -84,7 +219,7 @@ def test_no_solution_returns_no_solution_status():
 
 def test_travel_and_return_positive_for_spread_targets():
     dates = ["2025-11-23"]
-    branch = {"lat": 10.0, "lon": 123.0}
+    branch = BRANCH
     targets = [
         {"id": "T1", "lat": 10.0, "lon": 123.0, "stay_minutes": 10, "required": True, "time_window": None, "datetime_window": None},
         {"id": "T2", "lat": 10.6, "lon": 123.8, "stay_minutes": 10, "required": True, "time_window": None, "datetime_window": None},
@@ -96,7 +231,7 @@ def test_travel_and_return_positive_for_spread_targets():
         branch=branch,
         drivers_by_date=drivers_by_date,
         targets=targets,
-        speed_kmph=40.0,
+        speed_kmph=SPEED_KMPH,
         max_solve_seconds=1,
     )
     assert plan["status"] == "success"
@@ -104,7 +239,8 @@ def test_travel_and_return_positive_for_spread_targets():
     assert sched["routes"], "No routes created"
     route = sched["routes"][0]
     # Each stop should have non-zero travel, and total travel should be positive.
-    assert all(s.get("travel_minutes", 0) > 0 for s in route["stops"])
+    travel = np.fromiter((s.get("travel_minutes", 0) for s in route["stops"]), dtype=np.int64)
+    assert travel.size and travel.min() > 0
     assert route.get("travel_minutes", 0) > 0
 
 
@@ -114,7 +250,7 @@ def test_optimizer_beats_greedy_total_travel_no_time_windows():
     単純な逐次割当（ブランチ->targets順->ブランチ）より短いことを確認する。
     """
     dates = ["2025-11-23"]
-    branch = {"lat": 10.0, "lon": 123.0}
+    branch = BRANCH
     # 30件、規則的な配置で再現性を確保
     targets = []
     for i in range(30):
@@ -138,33 +274,21 @@ def test_optimizer_beats_greedy_total_travel_no_time_windows():
         branch=branch,
         drivers_by_date=drivers_by_date,
         targets=targets,
-        speed_kmph=40.0,
+        speed_kmph=SPEED_KMPH,
         max_solve_seconds=3,
     )
     assert plan["status"] == "success"
     # 総移動時間（return含む）
-    opt_total = 0.0
-    for sched in plan["schedules"]:
-        for r in sched["routes"]:
-            opt_total += r.get("travel_minutes", 0) + r.get("return_travel_minutes", 0)
+    opt_total = total_travel(plan)
+    # ソルバーが付与する合計値とルート再集計が一致すること（サニティチェック）
+    assert opt_total == pytest.approx(total_travel_resummed(plan))
 
     # ベースライン: targetsを順番に3等分して各ドライバーがブランチ->順番に巡回->ブランチに戻る
-    def route_time(seq):
-        if not seq:
-            return 0.0
-        total = 0.0
-        prev = (branch["lat"], branch["lon"])
-        for t in seq:
-            total += math.ceil(travel_time_minutes(haversine_km(prev, (t["lat"], t["lon"])), 40.0))
-            prev = (t["lat"], t["lon"])
-        total += math.ceil(travel_time_minutes(haversine_km(prev, (branch["lat"], branch["lon"])), 40.0))
-        return total
-
     chunk = len(targets) // 3
     baseline_total = (
-        route_time(targets[:chunk])
-        + route_time(targets[chunk : 2 * chunk])
-        + route_time(targets[2 * chunk :])
+        route_time_vec(targets[:chunk], branch, SPEED_KMPH, per_leg_ceil=True)
+        + route_time_vec(targets[chunk : 2 * chunk], branch, SPEED_KMPH, per_leg_ceil=True)
+        + route_time_vec(targets[2 * chunk :], branch, SPEED_KMPH, per_leg_ceil=True)
     )
 
     # 最適化解は単純逐次ルートと同等以下であることを期待（同じ丸め方法で比較）
@@ -177,7 +301,7 @@ def test_single_driver_grid_is_significantly_better_than_naive_order():
     単純なリスト順訪問（naive）より最適化解の総移動時間が十分短いことを確認。
     """
     dates = ["2025-11-23"]
-    branch = {"lat": 10.0, "lon": 123.0}
+    branch = BRANCH
     targets = []
     tid = 1
     for i in range(3):  # rows
@@ -201,28 +325,14 @@ def test_single_driver_grid_is_significantly_better_than_naive_order():
         branch=branch,
         drivers_by_date=drivers_by_date,
         targets=targets,
-        speed_kmph=40.0,
+        speed_kmph=SPEED_KMPH,
         max_solve_seconds=1,
     )
     assert plan["status"] == "success"
-    opt_total = 0.0
-    for sched in plan["schedules"]:
-        for r in sched["routes"]:
-            opt_total += r.get("travel_minutes", 0) + r.get("return_travel_minutes", 0)
+    opt_total = total_travel(plan)
 
     # naive: ブランチ→生成順に巡回→ブランチ
-    def route_time(seq):
-        if not seq:
-            return 0.0
-        total = 0.0
-        prev = (branch["lat"], branch["lon"])
-        for t in seq:
-            total += travel_time_minutes(haversine_km(prev, (t["lat"], t["lon"])), 40.0)
-            prev = (t["lat"], t["lon"])
-        total += travel_time_minutes(haversine_km(prev, (branch["lat"], branch["lon"])), 40.0)
-        return total
-
-    naive_total = route_time(targets)
+    naive_total = route_time_vec(targets, branch, SPEED_KMPH)
     # 最適化がナイーブより十分短いことを期待（32%以上短縮）
     assert opt_total <= naive_total * 0.68, f"optimized {opt_total:.1f} vs naive {naive_total:.1f}"
 
@@ -233,7 +343,7 @@ def test_three_drivers_multi_day_beats_naive_random_routes():
     ランダム割当＋ランダム順巡回より総移動時間が50%以下であることを確認。
     """
     dates = [f"2025-11-{23 + i:02d}" for i in range(5)]
-    branch = {"lat": 10.0, "lon": 123.0}
+    branch = BRANCH
     targets = []
     for i in range(53):
         targets.append(
@@ -247,43 +357,32 @@ def test_three_drivers_multi_day_beats_naive_random_routes():
                 "datetime_window": None,
             }
         )
-    drivers_by_date = {
-        d: [
-            {"id": "A", "start_time": 8 * 60, "end_time": 19 * 60},
-            {"id": "B", "start_time": 8 * 60, "end_time": 19 * 60},
-            {"id": "C", "start_time": 8 * 60, "end_time": 19 * 60},
-        ]
-        for d in dates
-    }
+    drivers_by_date = three_drivers_by_date(dates)
 
     plan = build_global_plan(
         dates=dates,
         branch=branch,
         drivers_by_date=drivers_by_date,
         targets=targets,
-        speed_kmph=40.0,
-        max_solve_seconds=3,
+        speed_kmph=SPEED_KMPH,
+        max_solve_seconds=2,
     )
     assert plan["status"] == "success"
-    opt_total = 0.0
-    for sched in plan["schedules"]:
-        for r in sched["routes"]:
-            opt_total += r.get("travel_minutes", 0) + r.get("return_travel_minutes", 0)
+    opt_total = total_travel(plan)
 
     # ナイーブランダム: 日付ごとにランダムに均等割当し、各ドライバーがランダム順に巡回（ブランチ発着）
-    import random
+    rng = random.Random(1234)
 
-    random.seed(1234)
     def random_baseline():
         total = 0.0
         pool = targets.copy()
-        random.shuffle(pool)
+        rng.shuffle(pool)
         per_day = len(pool) // len(dates)
         idx = 0
         for d in dates:
             day_targets = pool[idx : idx + per_day]
             idx += per_day
-            random.shuffle(day_targets)
+            rng.shuffle(day_targets)
             for drv in ["A", "B", "C"]:
                 if not day_targets:
                     continue
@@ -292,11 +391,7 @@ def test_three_drivers_multi_day_beats_naive_random_routes():
                 day_targets = day_targets[chunk:]
                 if not seq:
                     continue
-                prev = (branch["lat"], branch["lon"])
-                for t in seq:
-                    total += travel_time_minutes(haversine_km(prev, (t["lat"], t["lon"])), 40.0)
-                    prev = (t["lat"], t["lon"])
-                total += travel_time_minutes(haversine_km(prev, (branch["lat"], branch["lon"])), 40.0)
+                total += route_time_vec(seq, branch, SPEED_KMPH)
         return total
 
     naive_total = random_baseline()
@@ -304,30 +399,15 @@ def test_three_drivers_multi_day_beats_naive_random_routes():
     assert opt_total <= naive_total * 0.5, f"optimized {opt_total:.1f} vs naive {naive_total:.1f}"
 
 
-def test_three_drivers_single_day_not_worse_than_single_driver_optimal():
+def test_three_drivers_single_day_not_worse_than_single_driver_optimal(grid_targets_30, solve_cached):
     """
     3人・1日・時間枠なし・30件で、3人解の総移動時間が
     1人で全件を巡回する最適解（同じソルバーで計算）のおよそ1.3倍以内であることを確認。
     また、ターゲット重複割当がないことも確認する。
     """
     dates = ["2025-11-23"]
-    branch = {"lat": 10.0, "lon": 123.0}
-    targets = []
-    tid = 1
-    for i in range(5):  # rows
-        for j in range(6):  # cols => 30 targets
-            targets.append(
-                {
-                    "id": f"T{tid:03d}",
-                    "lat": branch["lat"] + 0.15 * (i - 2),
-                    "lon": branch["lon"] + 0.15 * (j - 3),
-                    "stay_minutes": 5,
-                    "required": True,
-                    "time_window": None,
-                    "datetime_window": None,
-                }
-            )
-            tid += 1
+    branch = BRANCH
+    targets = grid_targets_30
 
     # Multi-driver plan (3 drivers, wide time windows)
     drivers_multi = [{"id": "A", "start_time": 0, "end_time": 24 * 60}, {"id": "B", "start_time": 0, "end_time": 24 * 60}, {"id": "C", "start_time": 0, "end_time": 24 * 60}]
@@ -337,284 +417,78 @@ def test_three_drivers_single_day_not_worse_than_single_driver_optimal():
         branch=branch,
         drivers_by_date=drivers_by_date_multi,
         targets=targets,
-        speed_kmph=40.0,
-        max_solve_seconds=3,
+        speed_kmph=SPEED_KMPH,
+        max_solve_seconds=2,
     )
     assert plan_multi["status"] == "success"
 
-    opt_total_multi = 0.0
-    visited_ids = []
-    for sched in plan_multi["schedules"]:
-        for r in sched["routes"]:
-            opt_total_multi += r.get("travel_minutes", 0) + r.get("return_travel_minutes", 0)
-            visited_ids.extend([s["target_id"] for s in r.get("stops", [])])
-
+    opt_total_multi = total_travel(plan_multi)
+    visited = visited_ids(plan_multi)
     # No duplicate assignments
-    assert len(visited_ids) == len(set(visited_ids)) == len(targets)
+    assert len(visited) == len(set(visited)) == len(targets)
 
     # Single-driver optimal (same solver, long horizon)
     drivers_single = [{"id": "A", "start_time": 0, "end_time": 24 * 60}]
-    plan_single = build_global_plan(
+    plan_single = solve_cached(
         dates=dates,
         branch=branch,
         drivers_by_date={dates[0]: drivers_single},
         targets=targets,
-        speed_kmph=40.0,
+        speed_kmph=SPEED_KMPH,
         max_solve_seconds=1,
     )
     assert plan_single["status"] == "success"
-    opt_total_single = 0.0
-    for sched in plan_single["schedules"]:
-        for r in sched["routes"]:
-            opt_total_single += r.get("travel_minutes", 0) + r.get("return_travel_minutes", 0)
+    opt_total_single = total_travel(plan_single)
 
     # 3人解は1人解の1.3倍以内であることを期待
     assert opt_total_multi <= opt_total_single * 1.3, f"multi {opt_total_multi:.1f} vs single {opt_total_single:.1f}"
 
 
-def test_single_driver_multi_day_returns_vs_single_unconstrained():
-    """
-    1人・5営業日・30件（必須、時間枠なし）で、毎日拠点に戻る解の総移動時間が、
-    時間制限なし・拠点に戻らない1日解の1.3倍以内であること。
-    """
-    dates = [f"2025-11-{23 + i:02d}" for i in range(5)]
-    branch = {"lat": 10.0, "lon": 123.0}
-    targets = []
-    tid = 1
-    for i in range(5):
-        for j in range(6):
-            targets.append(
-                {
-                    "id": f"T{tid:03d}",
-                    "lat": branch["lat"] + 0.15 * (i - 2),
-                    "lon": branch["lon"] + 0.15 * (j - 3),
-                    "stay_minutes": 5,
-                    "required": True,
-                    "time_window": None,
-                    "datetime_window": None,
-                }
-            )
-            tid += 1
-
-    # 複数日・毎日戻る制約
-    drivers_by_date = {d: [{"id": "A", "start_time": 8 * 60, "end_time": 19 * 60}] for d in dates}
-    plan_multi = build_global_plan(
-        dates=dates,
-        branch=branch,
-        drivers_by_date=drivers_by_date,
-        targets=targets,
-        speed_kmph=40.0,
-        max_solve_seconds=3,
-    )
-    assert plan_multi["status"] == "success"
-    opt_total_multi = 0.0
-    for sched in plan_multi["schedules"]:
-        for r in sched["routes"]:
-            opt_total_multi += r.get("travel_minutes", 0) + r.get("return_travel_minutes", 0)
-    visited_ids = [s["target_id"] for sched in plan_multi["schedules"] for r in sched["routes"] for s in r.get("stops", [])]
-    assert len(visited_ids) == len(set(visited_ids)) == len(targets)
-
-    # 1日・時間無制限・拠点に戻らない（長い勤務時間）ベースライン
-    long_horizon = 5 * 24 * 60
-    plan_single = build_global_plan(
-        dates=[dates[0]],
-        branch=branch,
-        drivers_by_date={dates[0]: [{"id": "A", "start_time": 0, "end_time": long_horizon}]},
-        targets=targets,
-        speed_kmph=40.0,
-        max_solve_seconds=1,
-    )
-    assert plan_single["status"] == "success"
-    opt_total_single = 0.0
-    for sched in plan_single["schedules"]:
-        for r in sched["routes"]:
-            opt_total_single += r.get("travel_minutes", 0) + r.get("return_travel_minutes", 0)
-
-    assert opt_total_multi <= opt_total_single * 1.3, f"multi-day {opt_total_multi:.1f} vs single-unconstrained {opt_total_single:.1f}"
-
-
-def test_three_drivers_multi_day_vs_single_unconstrained():
+@pytest.mark.parametrize(
+    "grid_fixture,n_drivers,solve_s",
+    [
+        pytest.param("grid_targets_30", 1, 2, id="single-driver-30"),
+        pytest.param("grid_targets_36", 1, 2, id="single-driver-36"),
+        pytest.param("grid_targets_36", 3, 3, id="three-drivers-36"),
+        pytest.param("grid_targets_100", 3, 10, id="three-drivers-100", marks=pytest.mark.slow),
+    ],
+)
+def test_multi_day_returns_within_ratio_of_unconstrained(request, grid_fixture, n_drivers, solve_s, solve_cached):
     """
-    3人・5営業日・100件（必須、時間枠なし）で、毎日拠点に戻る総移動時間が、
+    5営業日・毎日拠点に戻る複数日解の総移動時間が、
     1人・時間無制限・拠点に戻らない最適解の1.3倍以内であること。
+    ドライバー数×件数の組をひとつのパラメタ族として検証し、
+    ターゲット重複割当がないことも併せて確認する。
     """
     dates = [f"2025-11-{23 + i:02d}" for i in range(5)]
-    branch = {"lat": 10.0, "lon": 123.0}
-    targets = []
-    tid = 1
-    for i in range(10):
-        for j in range(10):
-            if tid > 100:
-                break
-            targets.append(
-                {
-                    "id": f"T{tid:03d}",
-                    "lat": branch["lat"] + 0.8 * (i - 5) / 10.0,
-                    "lon": branch["lon"] + 0.8 * (j - 5) / 10.0,
-                    "stay_minutes": 5,
-                    "required": True,
-                    "time_window": None,
-                    "datetime_window": None,
-                }
-            )
-            tid += 1
-        if tid > 100:
-            break
-
-    drivers_by_date = {
-        d: [
-            {"id": "A", "start_time": 8 * 60, "end_time": 19 * 60},
-            {"id": "B", "start_time": 8 * 60, "end_time": 19 * 60},
-            {"id": "C", "start_time": 8 * 60, "end_time": 19 * 60},
-        ]
-        for d in dates
-    }
-    plan_multi = build_global_plan(
-        dates=dates,
-        branch=branch,
-        drivers_by_date=drivers_by_date,
-        targets=targets,
-        speed_kmph=40.0,
-        max_solve_seconds=10,
-    )
-    assert plan_multi["status"] == "success"
-    opt_total_multi = 0.0
-    visited_ids = []
-    for sched in plan_multi["schedules"]:
-        for r in sched["routes"]:
-            opt_total_multi += r.get("travel_minutes", 0) + r.get("return_travel_minutes", 0)
-            visited_ids.extend([s["target_id"] for s in r.get("stops", [])])
-    assert len(visited_ids) == len(set(visited_ids)) == len(targets)
-
-    long_horizon = 5 * 24 * 60
-    plan_single = build_global_plan(
-        dates=[dates[0]],
-        branch=branch,
-        drivers_by_date={dates[0]: [{"id": "A", "start_time": 0, "end_time": long_horizon}]},
-        targets=targets,
-        speed_kmph=40.0,
-        max_solve_seconds=1,
-    )
-    assert plan_single["status"] == "success"
-    opt_total_single = 0.0
-    visited_single = []
-    for sched in plan_single["schedules"]:
-        for r in sched["routes"]:
-            opt_total_single += r.get("travel_minutes", 0) + r.get("return_travel_minutes", 0)
-            visited_single.extend([s["target_id"] for s in r.get("stops", [])])
-    assert len(visited_single) == len(set(visited_single)) == len(targets)
-
-    assert opt_total_multi <= opt_total_single * 1.3, f"multi {opt_total_multi:.1f} vs single {opt_total_single:.1f}"
-
-
-def test_single_driver_multi_day_vs_unconstrained_100_targets():
-    """
-    1人・5営業日・100件（必須、時間枠なし、毎日戻る）で、総移動時間が
-    1人・時間無制限・戻らない最適解の1.3倍以内であること。
-    """
-    dates = [f"2025-11-{23 + i:02d}" for i in range(5)]
-    branch = {"lat": 10.0, "lon": 123.0}
-    targets = []
-    tid = 1
-    for i in range(10):
-        for j in range(10):
-            targets.append(
-                {
-                    "id": f"T{tid:03d}",
-                    "lat": branch["lat"] + 0.8 * (i - 5) / 10.0,
-                    "lon": branch["lon"] + 0.8 * (j - 5) / 10.0,
-                    "stay_minutes": 5,
-                    "required": True,
-                    "time_window": None,
-                    "datetime_window": None,
-                }
-            )
-            tid += 1
-
-    multi = build_global_plan(
-        dates=dates,
-        branch=branch,
-        drivers_by_date={d: [{"id": "A", "start_time": 8 * 60, "end_time": 19 * 60}] for d in dates},
-        targets=targets,
-        speed_kmph=40.0,
-        max_solve_seconds=5,
-    )
-    assert multi["status"] == "success"
-    opt_multi = sum(r.get("travel_minutes", 0) + r.get("return_travel_minutes", 0) for sched in multi["schedules"] for r in sched["routes"])
-    visited_multi = [s["target_id"] for sched in multi["schedules"] for r in sched["routes"] for s in r.get("stops", [])]
-    assert len(visited_multi) == len(set(visited_multi)) == len(targets)
-
-    unconstrained = build_global_plan(
-        dates=[dates[0]],
-        branch=branch,
-        drivers_by_date={dates[0]: [{"id": "A", "start_time": 0, "end_time": 5 * 24 * 60}]},
-        targets=targets,
-        speed_kmph=40.0,
-        max_solve_seconds=1,
-    )
-    assert unconstrained["status"] == "success"
-    opt_single = sum(r.get("travel_minutes", 0) + r.get("return_travel_minutes", 0) for sched in unconstrained["schedules"] for r in sched["routes"])
-    visited_single = [s["target_id"] for sched in unconstrained["schedules"] for r in sched["routes"] for s in r.get("stops", [])]
-    assert len(visited_single) == len(set(visited_single)) == len(targets)
-
-    assert opt_multi <= opt_single * 1.3, f"multi-day single-driver {opt_multi:.1f} vs unconstrained {opt_single:.1f}"
-
-
-def test_three_drivers_multi_day_vs_single_unconstrained_100_targets():
-    """
-    3人・5営業日・100件（必須、時間枠なし、毎日戻る）で、総移動時間が
-    1人・時間無制限・戻らない最適解の1.3倍以内であること。
-    """
-    dates = [f"2025-11-{23 + i:02d}" for i in range(5)]
-    branch = {"lat": 10.0, "lon": 123.0}
-    targets = []
-    tid = 1
-    for i in range(10):
-        for j in range(10):
-            targets.append(
-                {
-                    "id": f"T{tid:03d}",
-                    "lat": branch["lat"] + 0.8 * (i - 5) / 10.0,
-                    "lon": branch["lon"] + 0.8 * (j - 5) / 10.0,
-                    "stay_minutes": 5,
-                    "required": True,
-                    "time_window": None,
-                    "datetime_window": None,
-                }
-            )
-            tid += 1
+    branch = BRANCH
+    targets = request.getfixturevalue(grid_fixture)
 
+    roster = tuple(make_driver(x) for x in "ABC"[:n_drivers])
     multi = build_global_plan(
         dates=dates,
         branch=branch,
-        drivers_by_date={
-            d: [
-                {"id": "A", "start_time": 8 * 60, "end_time": 19 * 60},
-                {"id": "B", "start_time": 8 * 60, "end_time": 19 * 60},
-                {"id": "C", "start_time": 8 * 60, "end_time": 19 * 60},
-            ]
-            for d in dates
-        },
+        drivers_by_date=dict.fromkeys(dates, roster),
         targets=targets,
-        speed_kmph=40.0,
-        max_solve_seconds=10,
+        speed_kmph=SPEED_KMPH,
+        max_solve_seconds=solve_s,
     )
     assert multi["status"] == "success"
-    opt_multi = sum(r.get("travel_minutes", 0) + r.get("return_travel_minutes", 0) for sched in multi["schedules"] for r in sched["routes"])
-    visited_multi = [s["target_id"] for sched in multi["schedules"] for r in sched["routes"] for s in r.get("stops", [])]
+    opt_multi = total_travel(multi)
+    visited_multi = visited_ids(multi)
     assert len(visited_multi) == len(set(visited_multi)) == len(targets)
 
-    unconstrained = build_global_plan(
+    unconstrained = solve_cached(
         dates=[dates[0]],
         branch=branch,
         drivers_by_date={dates[0]: [{"id": "A", "start_time": 0, "end_time": 5 * 24 * 60}]},
         targets=targets,
-        speed_kmph=40.0,
+        speed_kmph=SPEED_KMPH,
         max_solve_seconds=1,
     )
     assert unconstrained["status"] == "success"
-    opt_single = sum(r.get("travel_minutes", 0) + r.get("return_travel_minutes", 0) for sched in unconstrained["schedules"] for r in sched["routes"])
-    visited_single = [s["target_id"] for sched in unconstrained["schedules"] for r in sched["routes"] for s in r.get("stops", [])]
+    opt_single = total_travel(unconstrained)
+    visited_single = visited_ids(unconstrained)
     assert len(visited_single) == len(set(visited_single)) == len(targets)
 
-    assert opt_multi <= opt_single * 1.3, f"multi-day 3-drivers {opt_multi:.1f} vs unconstrained {opt_single:.1f}"
+    assert opt_multi <= opt_single * 1.3, f"multi-day {opt_multi:.1f} vs unconstrained {opt_single:.1f}"
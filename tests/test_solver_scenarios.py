@@ -1,42 +1,68 @@
+import pytest
+
 from vrp.data import generate_branch, generate_targets
 from vrp.solver import build_daily_plan
 
 
-def test_one_driver_weekday_plan_runs():
-    branch = generate_branch(seed=1)
-    targets = generate_targets(seed=2, n=8)
+def _cfg(date, drivers, branch, **overrides):
     config = {
-        "date": "2024-12-12",
-        "drivers": [{"id": "A", "start_time": 8 * 60, "end_time": 19 * 60}],
+        "date": date,
+        "drivers": drivers,
         "branch": branch,
         "speed_kmph": 40.0,
         "max_solve_seconds": 10,
     }
-    plan = build_daily_plan(config, targets)
+    config.update(overrides)
+    return config
+
+
+@pytest.fixture(scope="session")
+def branch_seed1():
+    return generate_branch(seed=1)
+
+
+@pytest.fixture(scope="session")
+def targets_8_seed2():
+    return generate_targets(seed=2, n=8)
+
+
+@pytest.fixture(scope="session")
+def branch_seed3():
+    return generate_branch(seed=3)
+
+
+@pytest.fixture(scope="session")
+def targets_12_seed4():
+    return generate_targets(seed=4, n=12)
+
+
+def test_one_driver_weekday_plan_runs(branch_seed1, targets_8_seed2):
+    config = _cfg(
+        "2024-12-12",
+        [{"id": "A", "start_time": 8 * 60, "end_time": 19 * 60}],
+        branch_seed1,
+    )
+    plan = build_daily_plan(config, targets_8_seed2)
     assert plan["status"] == "success"
     assert "routes" in plan
     assert plan["routes"][0]["driver_id"] == "A"
 
 
-def test_three_driver_weekday_plan_runs():
-    branch = generate_branch(seed=3)
-    targets = generate_targets(seed=4, n=12)
-    config = {
-        "date": "2024-12-13",
-        "drivers": [
+def test_three_driver_weekday_plan_runs(branch_seed3, targets_12_seed4):
+    config = _cfg(
+        "2024-12-13",
+        [
             {"id": "A", "start_time": 8 * 60, "end_time": 19 * 60},
             {"id": "B", "start_time": 8 * 60, "end_time": 19 * 60},
             {"id": "C", "start_time": 8 * 60, "end_time": 19 * 60},
         ],
-        "branch": branch,
-        "speed_kmph": 40.0,
-        "max_solve_seconds": 10,
-    }
-    plan = build_daily_plan(config, targets)
+        branch_seed3,
+    )
+    plan = build_daily_plan(config, targets_12_seed4)
     assert plan["status"] == "success"
     assert len(plan["routes"]) == 3
     # Optional visits may be dropped; required should remain in route or reported unassigned
-    required_ids = {t["id"] for t in targets if t["required"]}
+    required_ids = {t["id"] for t in targets_12_seed4 if t["required"]}
     visited = {s["target_id"] for r in plan["routes"] for s in r["stops"]}
     unassigned = set(plan.get("unassigned", []))
     assert required_ids.issubset(visited.union(unassigned))